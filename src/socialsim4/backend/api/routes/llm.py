@@ -129,6 +129,7 @@ async def generate_agents(
         ]
 
         raw_text = llm.chat(messages)
+        llm.close()
 
         import json
 
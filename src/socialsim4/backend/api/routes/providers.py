@@ -137,6 +137,7 @@ async def test_provider(request: Request, provider_id: int) -> Message:
         provider.last_tested_at = datetime.now(timezone.utc)
         client = create_llm_client(cfg)
         client.chat([{"role": "user", "content": "ping"}])
+        client.close()
         provider.last_test_status = "success"
         provider.last_error = None
         await session.commit()
@@ -35,7 +35,7 @@ from ...schemas.simulation import (
     SnapshotCreate,
 )
 from ...services.simtree_runtime import SIM_TREE_REGISTRY, SimTreeRecord
-from ...services.simulations import generate_simulation_id, generate_simulation_name
+from ...services.simulations import generate_simulation_id, format_simulation_name
 
 
 logger = logging.getLogger(__name__)
@@ -196,7 +196,7 @@ async def create_simulation(request: Request, data: SimulationCreate) -> Simulat
             raise RuntimeError("LLM model required")
 
         sim_id = generate_simulation_id()
-        name = data.name or generate_simulation_name(sim_id)
+        name = data.name or format_simulation_name(sim_id)
         sim = Simulation(
             id=sim_id,
             owner_id=current_user.id,
@@ -359,6 +359,7 @@ async def resume_simulation(
 
             new_tree.set_tree_broadcast(_fanout)
             record.running.clear()
+            record.tree.close()
             record.tree = new_tree
 
         sim.status = "running"
@@ -378,7 +379,7 @@ async def copy_simulation(request: Request, simulation_id: str) -> SimulationBas
         new_sim = Simulation(
             id=new_id,
             owner_id=current_user.id,
-            name=generate_simulation_name(new_id),
+            name=format_simulation_name(new_id),
             scene_type=sim.scene_type,
             scene_config=sim.scene_config,
             agent_config=sim.agent_config,
@@ -10,6 +10,21 @@ from typing import Iterable
 from ..core.config import Settings, get_settings
 
 
+_VERIFY_SUBJECT = "Verify your SocialSim4 account"
+_VERIFY_TEXT = (
+    "Welcome to SocialSim4!\n\n"
+    "Click the link below to verify your email address:\n"
+    "{link}\n\n"
+    "If you did not create an account, you can ignore this message."
+)
+_VERIFY_HTML = (
+    "<p>Welcome to SocialSim4!</p>"
+    "<p>Click the link below to verify your email address:</p>"
+    "<p><a href='{link}'>Verify your email</a></p>"
+    "<p>If you did not create an account, you can ignore this message.</p>"
+)
+
+
 class EmailSender:
     def __init__(self, settings: Settings | None = None) -> None:
         self._settings = settings or get_settings()
@@ -37,20 +52,9 @@ class EmailSender:
         return True
 
     async def send_verification_email(self, recipient: str, verification_link: str) -> bool:
-        subject = "Verify your SocialSim4 account"
-        body_text = (
-            "Welcome to SocialSim4!\n\n"
-            "Click the link below to verify your email address:\n"
-            f"{verification_link}\n\n"
-            "If you did not create an account, you can ignore this message."
-        )
-        body_html = (
-            "<p>Welcome to SocialSim4!</p>"
-            "<p>Click the link below to verify your email address:</p>"
-            f"<p><a href='{verification_link}'>Verify your email</a></p>"
-            "<p>If you did not create an account, you can ignore this message.</p>"
-        )
-        return await self.send_email(subject, [recipient], body_text, body_html=body_html)
+        body_text = _VERIFY_TEXT.format(link=verification_link)
+        body_html = _VERIFY_HTML.format(link=verification_link)
+        return await self.send_email(_VERIFY_SUBJECT, [recipient], body_text, body_html=body_html)
 
     def _deliver(self, message: EmailMessage) -> None:
         host = self._settings.email_smtp_host
@@ -7,7 +7,7 @@ from typing import Dict
 from socialsim4.core.agent import Agent
 from socialsim4.core.event import PublicEvent
 from socialsim4.core.ordering import ControlledOrdering, CycledOrdering, SequentialOrdering
-from socialsim4.core.registry import ACTION_SPACE_MAP, SCENE_ACTIONS, SCENE_MAP
+from socialsim4.core.registry import SCENE_ACTIONS, SCENE_MAP
 from socialsim4.core.simtree import SimTree
 from socialsim4.core.simulator import Simulator
 from socialsim4.scenarios.basic import make_clients_from_env
@@ -53,47 +53,6 @@ def _build_tree_for_scene(scene_type: str, clients: dict | None = None) -> SimTr
     return SimTree.new(sim, active)
 
 
-def _apply_agent_config(simulator, agent_config: dict | None):
-    if not agent_config:
-        return
-    items = agent_config.get("agents") or []
-    agents_list = list(simulator.agents.values())
-    count = min(len(items), len(agents_list))
-    # First apply names/profiles by position, then rebuild mapping
-    for i in range(count):
-        cfg = items[i] or {}
-        agent = agents_list[i]
-        new_name = str(cfg.get("name") or "").strip()
-        if new_name:
-            agent.name = new_name
-        profile = str(cfg.get("profile") or "").strip()
-        if profile:
-            agent.user_profile = profile
-    # Rebuild agents mapping to reflect renames
-    simulator.agents = {a.name: a for a in agents_list}
-    # Now apply actions (scene common + selected) per agent
-    for i in range(count):
-        cfg = items[i] or {}
-        agent = agents_list[i]
-        selected = [str(a) for a in (cfg.get("action_space") or [])]
-        scene_actions = simulator.scene.get_scene_actions(agent) or []
-        picked = []
-        for key in selected:
-            act = ACTION_SPACE_MAP.get(key)
-            if act is not None:
-                picked.append(act)
-        merged = []
-        seen: set[str] = set()
-        for act in list(scene_actions) + picked:
-            n = getattr(act, "NAME", None)
-            if n and n not in seen:
-                merged.append(act)
-                seen.add(n)
-        agent.action_space = merged
-    # Refresh ordering candidates after renames
-    simulator.ordering.set_simulation(simulator)
-
-
 def _build_tree_for_sim(sim_record, clients: dict | None = None) -> SimTree:
     scene_type = sim_record.scene_type
     scene_cls = SCENE_MAP.get(scene_type)
@@ -143,17 +102,17 @@ def _build_tree_for_sim(sim_record, clients: dict | None = None) -> SimTree:
     items = (getattr(sim_record, "agent_config", {}) or {}).get("agents") or []
     built_agents = []
     emotion_enabled = cfg["emotion_enabled"] if ("emotion_enabled" in cfg) else False
+    # scene common actions from registry; identical for every agent of this scene
+    reg = SCENE_ACTIONS.get(scene_type)
+    basic_names = tuple(reg.get("basic", ()))
     for cfg_agent in items:
         aname = str(cfg_agent.get("name") or "").strip() or "Agent"
         profile = str(cfg_agent.get("profile") or "")
         selected = [str(a) for a in (cfg_agent.get("action_space") or [])]
-        # scene common actions from registry (fallback to scene introspection)
-        reg = SCENE_ACTIONS.get(scene_type)
-        basic_names = list(reg.get("basic", []))
 
         seen = set()
         merged_names = []
-        for n in basic_names + selected:
+        for n in (*basic_names, *selected):
             if n and n not in seen:
                 seen.add(n)
                 merged_names.append(n)
@@ -305,7 +264,9 @@ class SimTreeRegistry:
             return record
 
     def remove(self, simulation_id: str) -> None:
-        self._records.pop(simulation_id.upper(), None)
+        record = self._records.pop(simulation_id.upper(), None)
+        if record is not None:
+            record.tree.close()
 
     def get(self, simulation_id: str) -> SimTreeRecord | None:
         return self._records.get(simulation_id.upper())
@@ -2,9 +2,9 @@ import secrets
 
 
 def generate_simulation_id() -> str:
-    return secrets.token_hex(2).upper()
+    # 16 random bits rendered as 4 upper-case hex chars, one CSPRNG draw
+    return f"{secrets.randbits(16):04X}"
 
 
-def generate_simulation_name(sim_id: str | None = None) -> str:
-    suffix = sim_id or generate_simulation_id()
-    return f"Simulation #{suffix}"
+def format_simulation_name(sim_id: str) -> str:
+    return f"Simulation #{sim_id}"
@@ -31,13 +31,13 @@ async def issue_verification_token(session: AsyncSession, user: User) -> Verific
         expires_at=expires_at,
     )
     session.add(token)
+    # Sessions are created with expire_on_commit=False and every column is
+    # populated client-side (id comes back from the INSERT), so no refresh.
     await session.commit()
-    await session.refresh(token)
     return token
 
 
 async def get_verification_token(session: AsyncSession, token_value: str) -> VerificationToken | None:
-    query = await session.execute(
+    return await session.scalar(
         select(VerificationToken).where(VerificationToken.token == token_value)
     )
-    return query.scalar_one_or_none()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import os
+from types import MappingProxyType
 from typing import Iterable
 
 from socialsim4.core.llm import create_llm_client
@@ -11,6 +12,27 @@ from socialsim4.core.llm_config import LLMConfig
 from socialsim4.scenarios import SCENES, console_logger
 
 
+MODEL_DEFAULTS = MappingProxyType(
+    {
+        "openai": "gpt-4o-mini",
+        "gemini": "gemini-2.0-flash-exp",
+        "mock": "mock",
+    }
+)
+
+_LLM_ENV_KEYS = (
+    "LLM_DIALECT",
+    "LLM_API_KEY",
+    "LLM_MODEL",
+    "LLM_BASE_URL",
+    "LLM_TEMPERATURE",
+    "LLM_TOP_P",
+    "LLM_FREQUENCY_PENALTY",
+    "LLM_PRESENCE_PENALTY",
+    "LLM_MAX_TOKENS",
+)
+
+
 def serve_backend(host: str, port: int, reload: bool) -> None:
     import uvicorn
 
@@ -23,47 +45,37 @@ def serve_backend(host: str, port: int, reload: bool) -> None:
 
 
 def build_llm_clients(args: argparse.Namespace) -> dict[str, object]:
-    dialect = (args.dialect or os.getenv("LLM_DIALECT") or "").strip().lower()
+    env = {key: os.environ.get(key) for key in _LLM_ENV_KEYS}
+
+    dialect = (args.dialect or env["LLM_DIALECT"] or "").strip().lower()
     if not dialect:
         raise SystemExit("LLM dialect is required. Use --dialect or set LLM_DIALECT.")
     if dialect not in {"openai", "gemini", "mock"}:
         raise SystemExit(f"Unsupported LLM dialect: {dialect}")
 
-    api_key = args.api_key or os.getenv("LLM_API_KEY")
+    api_key = args.api_key or env["LLM_API_KEY"]
     if dialect != "mock" and not api_key:
         raise SystemExit("API key is required for real LLM usage. Provide --api-key or set LLM_API_KEY.")
 
-    model_defaults = {
-        "openai": "gpt-4o-mini",
-        "gemini": "gemini-2.0-flash-exp",
-        "mock": "mock",
-    }
-    model = args.model or os.getenv("LLM_MODEL") or model_defaults[dialect]
-
-    def _float(option: str, env: str, default: float) -> float:
-        value = getattr(args, option)
-        if value is not None:
-            return value
-        env_val = os.getenv(env)
-        return float(env_val) if env_val is not None else default
+    model = args.model or env["LLM_MODEL"] or MODEL_DEFAULTS[dialect]
 
-    def _int(option: str, env: str, default: int) -> int:
+    def _coerce(option: str, env_key: str, default, ctor):
         value = getattr(args, option)
         if value is not None:
             return value
-        env_val = os.getenv(env)
-        return int(env_val) if env_val is not None else default
+        env_val = env[env_key]
+        return ctor(env_val) if env_val is not None else default
 
     config = LLMConfig(
         dialect=dialect,
         api_key=api_key or "",
         model=model,
-        base_url=args.base_url or os.getenv("LLM_BASE_URL"),
-        temperature=_float("temperature", "LLM_TEMPERATURE", 0.7),
-        top_p=_float("top_p", "LLM_TOP_P", 1.0),
-        frequency_penalty=_float("frequency_penalty", "LLM_FREQUENCY_PENALTY", 0.0),
-        presence_penalty=_float("presence_penalty", "LLM_PRESENCE_PENALTY", 0.0),
-        max_tokens=_int("max_tokens", "LLM_MAX_TOKENS", 1024),
+        base_url=args.base_url or env["LLM_BASE_URL"],
+        temperature=_coerce("temperature", "LLM_TEMPERATURE", 0.7, float),
+        top_p=_coerce("top_p", "LLM_TOP_P", 1.0, float),
+        frequency_penalty=_coerce("frequency_penalty", "LLM_FREQUENCY_PENALTY", 0.0, float),
+        presence_penalty=_coerce("presence_penalty", "LLM_PRESENCE_PENALTY", 0.0, float),
+        max_tokens=_coerce("max_tokens", "LLM_MAX_TOKENS", 1024, int),
     )
 
     client = create_llm_client(config)
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 class Action:
     NAME = "base_action"
     INSTRUCTION = ""
@@ -16,3 +19,26 @@ class Action:
         - pass_control: whether to pass control to the next agent immediately
         """
         raise NotImplementedError
+
+
+def fail_action(agent, action: str, key: str, msg: str):
+    """Tell the agent why `action` was rejected; return the failure 5-tuple."""
+    agent.add_env_feedback(msg)
+    return False, {"error": key}, f"{agent.name} {action} failed", {}, False
+
+
+@lru_cache(maxsize=128)
+def assemble_instructions(action_types: tuple) -> str:
+    """Concatenate the INSTRUCTION blocks for an action-space signature.
+
+    Keyed by the tuple of Action classes (in action-space order); agents with
+    the same action space share one cached usage block across turns.
+    """
+    return "".join(cls.INSTRUCTION for cls in action_types)
+
+
+@lru_cache(maxsize=128)
+def assemble_catalog(action_types: tuple) -> str:
+    """The "- NAME: DESC" listing for an action-space signature (cached like the usage block)."""
+    return "\n".join(f"- {cls.NAME}: {cls.DESC}".strip() for cls in action_types)
+
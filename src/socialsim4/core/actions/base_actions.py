@@ -77,15 +77,12 @@ class TalkToAction(Action):
             return False, {"error": error}, f"{agent.name} failed to talk", {}, False
 
         # Range check for scenes with spatial chat
-        sxy = agent.properties.get("map_xy")
-        txy = target.properties.get("map_xy")
-        dist = abs(sxy[0] - txy[0]) + abs(sxy[1] - txy[1])
-        in_range = dist <= scene.chat_range
-
-        if not in_range:
+        sx, sy = agent.properties["map_xy"]
+        tx, ty = target.properties["map_xy"]
+        if abs(sx - tx) + abs(sy - ty) > scene.chat_range:
             error = f"{to_name} is too far to talk to."
             agent.add_env_feedback(error)
-            return False, {"error": error}, f"{agent.name} failed to talk"
+            return False, {"error": error}, f"{agent.name} failed to talk", {}, False
 
         event = TalkToEvent(agent.name, to_name, message)
         # Sender always sees their own speech
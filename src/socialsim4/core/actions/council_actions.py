@@ -1,6 +1,28 @@
+from collections import Counter
+
 from socialsim4.core.action import Action
 from socialsim4.core.event import MessageEvent, PublicEvent
 
+# Fixed prompt prefix for request_brief; keep it first and unchanged so the
+# provider can reuse its cached prefill across calls.
+BRIEF_SYSTEM_PROMPT = (
+    "You are a policy analyst assisting a legislative council debate. "
+    "Generate a neutral, factual, concise briefing to unblock discussion. "
+    "Output plain text only (no JSON, no role tags)."
+)
+BRIEF_USER_PREFIX = (
+    "Provide 5–7 crisp bullets with concrete facts, examples, or precedents. "
+    "Include numbers if helpful and clearly label estimates. Keep under ~180 words.\n"
+)
+
+# Per-scene brief cache bound (oldest entry evicted first)
+BRIEF_CACHE_SIZE = 256
+
+
+def _brief_key(desc: str) -> str:
+    """Case/whitespace-insensitive key for a brief topic (word order matters)."""
+    return " ".join(desc.casefold().split())
+
 
 class StartVotingAction(Action):
     NAME = "start_voting"
@@ -48,21 +70,16 @@ class VotingStatusAction(Action):
     def handle(self, action_data, agent, simulator, scene):
         started = scene.state.get("voting_started", False)
         votes = scene.state.get("votes", {})
-        num_members = sum(1 for a in simulator.agents.values() if a.name != "Host")
+        num_members = len(simulator.non_host_members)
         if not started:
             agent.add_env_feedback("Voting has not started.")
             result = {"started": False, "members": num_members}
             summary = "Voting not started"
             return True, result, summary, {}, False
 
-        yes = sum(v == "yes" for v in votes.values())
-        no = sum(v == "no" for v in votes.values())
-        abstain = sum(v == "abstain" for v in votes.values())
-        pending_names = [
-            name
-            for name in simulator.agents.keys()
-            if name != "Host" and name not in votes
-        ]
+        tally = Counter(votes.values())
+        yes, no, abstain = tally["yes"], tally["no"], tally["abstain"]
+        pending_names = [name for name in simulator.non_host_members if name not in votes]
         pending = len(pending_names)
         lines = [
             f"Voting status on: {scene.state.get('vote_title', '(untitled)')}:",
@@ -115,41 +132,44 @@ class RequestBriefAction(Action):
 
         desc = action_data["desc"]
 
-        # Prepare a concise LLM prompt for a short, actionable briefing
-        system_prompt = (
-            "You are a policy analyst assisting a legislative council debate. "
-            "Generate a neutral, factual, concise briefing to unblock discussion. "
-            "Output plain text only (no JSON, no role tags)."
-        )
-        user_prompt = (
-            "Provide 5–7 crisp bullets with concrete facts, examples, or precedents. "
-            "Include numbers if helpful and clearly label estimates. Keep under ~180 words.\n"
-            f"Need: {desc}\n"
-        )
-
-        # Try using the configured LLM
-        material = agent.call_llm(
-            simulator.clients,
-            [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
-        # Assume LLM returns a string in this prototype
-
-        used_fallback = False
-        if not material.strip():
-            # Fallback: short list of prompts to guide discussion
-            material = (
-                f"- Scope: {desc}\n"
-                "- Key fact/definition\n"
-                "- Comparable example (outcome)\n"
-                "- Stakeholders: who benefits / pays\n"
-                "- Rough cost or impact (estimate)\n"
-                "- Top risk and mitigation\n"
-                "- Open question for the chamber"
+        # Briefs are reused per scene for the same topic (ignoring case and
+        # spacing), skipping a full LLM round trip. The cache lives on the
+        # scene object, not in scene.state, so snapshots/branches stay small.
+        cache = scene.brief_cache
+        key = _brief_key(desc)
+        material = cache.pop(key, None)
+        if material is not None:
+            # Re-insert to mark as most recently used
+            cache[key] = material
+            source = "cache"
+        else:
+            # Static system prompt + instruction preamble form a byte-identical
+            # prefix across briefs (provider prefix caching); only Need varies.
+            material = agent.call_llm(
+                simulator.clients,
+                [
+                    {"role": "system", "content": BRIEF_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"{BRIEF_USER_PREFIX}Need: {desc}\n"},
+                ],
             )
-            used_fallback = True
+            # Assume LLM returns a string in this prototype
+            source = "llm"
+            if material.strip():
+                cache[key] = material
+                if len(cache) > BRIEF_CACHE_SIZE:
+                    del cache[next(iter(cache))]
+            else:
+                # Fallback: short list of prompts to guide discussion
+                material = (
+                    f"- Scope: {desc}\n"
+                    "- Key fact/definition\n"
+                    "- Comparable example (outcome)\n"
+                    "- Stakeholders: who benefits / pays\n"
+                    "- Rough cost or impact (estimate)\n"
+                    "- Top risk and mitigation\n"
+                    "- Open question for the chamber"
+                )
+                source = "fallback"
 
         content = f"Brief (private) on '{desc}':\n{material.strip()}"
         # Deliver privately to host and record the event (private)
@@ -159,7 +179,7 @@ class RequestBriefAction(Action):
         result = {
             "desc": desc,
             "material": material.strip(),
-            "source": ("fallback" if used_fallback else "llm"),
+            "source": source,
         }
         summary = f"{agent.name} requested a brief: {desc}"
         return True, result, summary, {}, False
@@ -173,21 +193,23 @@ class VoteAction(Action):
 """
 
     def handle(self, action_data, agent, simulator, scene):
-        if not scene.state.get("voting_started", False):
+        st = scene.state
+        if not st.get("voting_started", False):
             error = "Voting has not started yet."
             agent.add_env_feedback(error)
             return False, {"error": error}, f"{agent.name} vote failed", {}, False
 
-        if agent.name in scene.state.get("votes", {}):
+        votes = st.setdefault("votes", {})
+        if agent.name in votes:
             error = "You have already voted."
             agent.add_env_feedback(error)
             return False, {"error": error}, f"{agent.name} vote failed", {}, False
 
         vote = action_data.get("vote")
         if vote in ["yes", "no", "abstain"] and agent.name != "Host":
-            scene.state.setdefault("votes", {})[agent.name] = vote
+            votes[agent.name] = vote
             comment = action_data.get("comment", "")
-            title = scene.state.get("vote_title", "the draft")
+            title = st.get("vote_title", "the draft")
             vote_message = f"I vote {vote} on '{title}'."
             if comment:
                 vote_message += f" Comment: {comment}"
@@ -198,17 +220,14 @@ class VoteAction(Action):
             result = {"vote": vote, "comment": comment}
             summary = f"{agent.name} voted {vote}"
             # Auto-conclude when all non-host members have voted
-            num_members = sum(1 for a in simulator.agents.values() if a.name != "Host")
-            votes = scene.state.get("votes", {})
+            num_members = len(simulator.non_host_members)
             if (
-                scene.state.get("voting_started", False)
-                and num_members > 0
+                num_members > 0
                 and len(votes) >= num_members
-                and not scene.state.get("voting_completed_announced", False)
+                and not st.get("voting_completed_announced", False)
             ):
-                yes = sum(v == "yes" for v in votes.values())
-                no = sum(v == "no" for v in votes.values())
-                abstain = sum(v == "abstain" for v in votes.values())
+                tally = Counter(votes.values())
+                yes, no, abstain = tally["yes"], tally["no"], tally["abstain"]
                 result_text = "passed" if yes > num_members / 2 else "failed"
                 simulator.broadcast(
                     PublicEvent(
@@ -216,13 +235,13 @@ class VoteAction(Action):
                     )
                 )
                 # Archive result and reset voting state; do NOT end the scene
-                past = scene.state.get("past_votes") or []
-                past.append({"title": title, "yes": yes, "no": no, "abstain": abstain})
-                scene.state["past_votes"] = past
-                scene.state["voting_started"] = False
-                scene.state["voting_completed_announced"] = True
-                scene.state["votes"] = {}
-                scene.state["vote_title"] = ""
+                st.setdefault("past_votes", []).append(
+                    {"title": title, "yes": yes, "no": no, "abstain": abstain}
+                )
+                st["voting_started"] = False
+                st["voting_completed_announced"] = True
+                st["votes"] = {}
+                st["vote_title"] = ""
             return True, result, summary, {}, True
         error = "Invalid vote or role."
         agent.add_env_feedback(error)
@@ -1,8 +1,23 @@
 from typing import Dict, List
 
-from socialsim4.core.action import Action
+from socialsim4.core.action import Action, fail_action
 from socialsim4.core.event import PublicEvent
 
+_RANK_ORDER = ("3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A", "2", "SJ", "BJ")
+
+
+def _hand_str(scene, name: str) -> str:
+    """Space-separated hand tokens in rank order."""
+    h = scene.state.get("hands", {}).get(name, {})
+    return " ".join(r for r in _RANK_ORDER for _ in range(h.get(r, 0)))
+
+
+def _fail_play(agent, scene, attempt_str: str, key: str, msg: str):
+    """play_cards failure: the summary echoes the attempt and the remaining hand."""
+    agent.add_env_feedback(msg)
+    summary = f"{agent.name} tried: {attempt_str} -> {key} | remaining: {_hand_str(scene, agent.name)}"
+    return False, {"error": key}, summary, {}, False
+
 
 class CallLandlordAction(Action):
     NAME = "call_landlord"
@@ -17,14 +32,13 @@ class CallLandlordAction(Action):
             scene.state.get("phase") != "bidding"
             or scene.state.get("bidding_stage") != "call"
         ):
-            agent.add_env_feedback("You can only call during the call stage.")
-            return False, {"error": "wrong_stage"}, f"{agent.name} call_landlord failed"
+            return fail_action(agent, "call_landlord", "wrong_stage", "You can only call during the call stage.")
         idx = scene.state.get("bid_turn_index")
         scene.state["landlord_candidate"] = agent.name
         scene.state["bidding_stage"] = "rob"
 
         # Initialize ROB stage trackers
-        players: List[str] = list(scene.state.get("players"))
+        players: List[str] = scene.state["players"]
         rob_eligible = [p for p in players if p != agent.name]
         scene.state["rob_eligible"] = rob_eligible
         scene.state["rob_acted"] = {p: False for p in rob_eligible}
@@ -47,25 +61,16 @@ class RobLandlordAction(Action):
             scene.state.get("phase") != "bidding"
             or scene.state.get("bidding_stage") != "rob"
         ):
-            agent.add_env_feedback("You can only rob during the rob stage.")
-            return False, {"error": "wrong_stage"}, f"{agent.name} rob_landlord failed"
+            return fail_action(agent, "rob_landlord", "wrong_stage", "You can only rob during the rob stage.")
 
-        rob_acted: Dict[str, bool] = dict(scene.state.get("rob_acted"))
+        rob_acted: Dict[str, bool] = scene.state["rob_acted"]
         if rob_acted[agent.name]:
-            agent.add_env_feedback("You already acted in rob stage.")
-            return (
-                False,
-                {"error": "already_acted"},
-                f"{agent.name} rob_landlord failed",
-            )
+            return fail_action(agent, "rob_landlord", "already_acted", "You already acted in rob stage.")
 
         # Apply rob: candidate changes, multiplier doubles
         scene.state["landlord_candidate"] = agent.name
-        scene.state["score_multiplier"] = (
-            int(scene.state.get("score_multiplier", 1)) * 2
-        )
+        scene._double_multiplier()
         rob_acted[agent.name] = True
-        scene.state["rob_acted"] = rob_acted
 
         simulator.broadcast(
             PublicEvent(f"{agent.name} robbed the landlord. Multiplier x2.")
@@ -94,37 +99,28 @@ class PassAction(Action):
                 simulator.broadcast(PublicEvent(f"{agent.name} did not call."))
                 return True, {"pass": True}, f"{agent.name} passed call", {}, True
             elif stage == "rob":
-                rob_acted: Dict[str, bool] = dict(scene.state.get("rob_acted"))
+                rob_acted: Dict[str, bool] = scene.state["rob_acted"]
                 if rob_acted[agent.name]:
-                    agent.add_env_feedback("You already acted in rob stage.")
-                    return (
-                        False,
-                        {"error": "already_acted"},
-                        f"{agent.name} pass failed",
-                    )
+                    return fail_action(agent, "pass", "already_acted", "You already acted in rob stage.")
                 rob_acted[agent.name] = True
-                scene.state["rob_acted"] = rob_acted
                 simulator.broadcast(PublicEvent(f"{agent.name} did not rob."))
                 if all(rob_acted.values()):
                     scene._finalize_landlord(simulator)
                 return True, {"pass": True}, f"{agent.name} passed rob", {}, True
             else:
-                agent.add_env_feedback("Unknown bidding stage.")
-                return False, {"error": "bad_stage"}, f"{agent.name} pass failed", {}, False
+                return fail_action(agent, "pass", "bad_stage", "Unknown bidding stage.")
 
         if phase == "playing":
             # Only current player may pass; cannot pass if starting a new trick
             lead = scene.state.get("leading_combo")
             if lead is None:
-                agent.add_env_feedback("You must lead; cannot pass.")
-                return False, {"error": "cannot_pass_lead"}, f"{agent.name} pass failed"
+                return fail_action(agent, "pass", "cannot_pass_lead", "You must lead; cannot pass.")
 
             simulator.broadcast(PublicEvent(f"{agent.name} passed."))
             scene._on_player_pass(simulator)
             return True, {"pass": True}, f"{agent.name} passed", {}, True
 
-        agent.add_env_feedback("You cannot pass right now.")
-        return False, {"error": "bad_phase"}, f"{agent.name} pass failed", {}, False
+        return fail_action(agent, "pass", "bad_phase", "You cannot pass right now.")
 
 
 class PlayCardsAction(Action):
@@ -137,56 +133,25 @@ Available tokens: 3 4 5 6 7 8 9 10 J Q K A 2 SJ BJ
 """
 
     def handle(self, action_data, agent, simulator, scene):
-        # Helpers
-        def _hand_tokens(name: str) -> List[str]:
-            h = scene.state.get("hands", {}).get(name, {})
-            order = ["3","4","5","6","7","8","9","10","J","Q","K","A","2","SJ","BJ"]
-            toks: List[str] = []
-            for r in order:
-                c = h.get(r, 0)
-                if c:
-                    toks.extend([r] * c)
-            return toks
-
         cards_str = action_data.get("cards")
-        attempted = [t for t in (cards_str or "").strip().split() if t]
 
         if scene.state.get("phase") != "playing":
-            agent.add_env_feedback("You can only play during the playing phase.")
-            remaining_str = " ".join(_hand_tokens(agent.name))
-            attempt_str = " ".join(attempted) if attempted else "(none)"
-            summary = f"{agent.name} tried: {attempt_str} -> wrong_phase | remaining: {remaining_str}"
-            return False, {"error": "wrong_phase"}, summary, {}, False
+            attempt_str = " ".join((cards_str or "").split()) or "(none)"
+            return _fail_play(agent, scene, attempt_str, "wrong_phase", "You can only play during the playing phase.")
         if not cards_str or not cards_str.strip():
-            agent.add_env_feedback("Provide cards to play.")
-            remaining_str = " ".join(_hand_tokens(agent.name))
-            summary = f"{agent.name} tried: (none) -> missing_cards | remaining: {remaining_str}"
-            return False, {"error": "missing_cards"}, summary, {}, False
+            return _fail_play(agent, scene, "(none)", "missing_cards", "Provide cards to play.")
 
-        tokens = scene._parse_cards_str(cards_str)
-        attempted = list(tokens)
+        tokens, attempt_str = scene._parse_cards_str(cards_str)
         if not scene._has_cards(agent.name, tokens):
-            agent.add_env_feedback("You don't have those cards.")
-            remaining_str = " ".join(_hand_tokens(agent.name))
-            attempt_str = " ".join(attempted)
-            summary = f"{agent.name} tried: {attempt_str} -> not_in_hand | remaining: {remaining_str}"
-            return False, {"error": "not_in_hand"}, summary, {}, False
+            return _fail_play(agent, scene, attempt_str, "not_in_hand", "You don't have those cards.")
 
         combo = scene._evaluate_combo(tokens)
         if combo is None:
-            agent.add_env_feedback("Invalid combination.")
-            remaining_str = " ".join(_hand_tokens(agent.name))
-            attempt_str = " ".join(attempted)
-            summary = f"{agent.name} tried: {attempt_str} -> invalid_combo | remaining: {remaining_str}"
-            return False, {"error": "invalid_combo"}, summary, {}, False
+            return _fail_play(agent, scene, attempt_str, "invalid_combo", "Invalid combination.")
 
         lead = scene.state.get("leading_combo")
         if lead is not None and not scene._can_beat(combo, lead):
-            agent.add_env_feedback("Your play does not beat the current lead.")
-            remaining_str = " ".join(_hand_tokens(agent.name))
-            attempt_str = " ".join(attempted)
-            summary = f"{agent.name} tried: {attempt_str} -> not_beating | remaining: {remaining_str}"
-            return False, {"error": "not_beating"}, summary, {}, False
+            return _fail_play(agent, scene, attempt_str, "not_beating", "Your play does not beat the current lead.")
 
         # Accept play
         scene._remove_cards(agent.name, tokens)
@@ -195,25 +160,19 @@ Available tokens: 3 4 5 6 7 8 9 10 J Q K A 2 SJ BJ
 
         # Bomb/Rocket multiplier
         if combo["type"] in ("bomb", "rocket"):
-            scene.state["score_multiplier"] = (
-                int(scene.state.get("score_multiplier", 1)) * 2
-            )
+            scene._double_multiplier()
 
         simulator.broadcast(PublicEvent(f"{agent.name} played: {cards_str} ({combo['type']})."))
 
         # Win check
         if scene._hand_size(agent.name) == 0:
             scene._on_player_won(agent.name, simulator)
-            remaining_str = " ".join(_hand_tokens(agent.name)) or "(empty)"
-            attempt_str = " ".join(attempted)
-            summary = f"{agent.name} played: {attempt_str} ({combo['type']}), remaining: {remaining_str} [WIN]"
+            summary = f"{agent.name} played: {attempt_str} ({combo['type']}), remaining: {_hand_str(scene, agent.name) or '(empty)'} [WIN]"
             return True, {"played": tokens, "win": True}, summary, {}, True
 
         # Advance turn on successful play
         scene._advance_turn()
-        remaining_str = " ".join(_hand_tokens(agent.name))
-        attempt_str = " ".join(attempted)
-        summary = f"{agent.name} played: {attempt_str} ({combo['type']}), remaining: {remaining_str}"
+        summary = f"{agent.name} played: {attempt_str} ({combo['type']}), remaining: {_hand_str(scene, agent.name)}"
         return True, {"played": tokens}, summary, {}, True
 
 
@@ -227,18 +186,13 @@ class DoubleAction(Action):
 
     def handle(self, action_data, agent, simulator, scene):
         if scene.state.get("phase") != "doubling":
-            agent.add_env_feedback("You can only double during the doubling stage.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} double failed", {}, False
-        acted = dict(scene.state.get("doubling_acted"))
+            return fail_action(agent, "double", "wrong_phase", "You can only double during the doubling stage.")
+        acted = scene.state["doubling_acted"]
         if acted.get(agent.name, False):
-            agent.add_env_feedback("You already acted in doubling stage.")
-            return False, {"error": "already_acted"}, f"{agent.name} double failed", {}, False
+            return fail_action(agent, "double", "already_acted", "You already acted in doubling stage.")
 
-        scene.state["score_multiplier"] = (
-            int(scene.state.get("score_multiplier", 1)) * 2
-        )
+        scene._double_multiplier()
         acted[agent.name] = True
-        scene.state["doubling_acted"] = acted
         simulator.broadcast(PublicEvent(f"{agent.name} doubled. Multiplier x2."))
         scene._advance_doubling(simulator)
         return True, {"double": True}, f"{agent.name} doubled", {}, True
@@ -254,15 +208,12 @@ class NoDoubleAction(Action):
 
     def handle(self, action_data, agent, simulator, scene):
         if scene.state.get("phase") != "doubling":
-            agent.add_env_feedback("You can only act during the doubling stage.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} no_double failed", {}, False
-        acted = dict(scene.state.get("doubling_acted"))
+            return fail_action(agent, "no_double", "wrong_phase", "You can only act during the doubling stage.")
+        acted = scene.state["doubling_acted"]
         if acted.get(agent.name, False):
-            agent.add_env_feedback("You already acted in doubling stage.")
-            return False, {"error": "already_acted"}, f"{agent.name} no_double failed", {}, False
+            return fail_action(agent, "no_double", "already_acted", "You already acted in doubling stage.")
 
         acted[agent.name] = True
-        scene.state["doubling_acted"] = acted
         simulator.broadcast(PublicEvent(f"{agent.name} declined to double."))
         scene._advance_doubling(simulator)
         return True, {"double": False}, f"{agent.name} declined doubling", {}, True
@@ -18,10 +18,14 @@ class ScheduleOrderAction(Action):
         raw = action_data["order"]
         s = raw.strip()
         names = [x.strip() for x in s.split(",")]
-
-        # No robustness: do not validate membership; let simulator handle unknowns.
-        # Just push the list exactly as given into the ordering queue.
+        # Drop unknown names here and report them, so the moderator sees
+        # its typo instead of believing a phantom agent was scheduled.
+        unknown = [n for n in names if n not in simulator.agents]
+        names = [n for n in names if n in simulator.agents]
         simulator.ordering.add_to_queue(names)
 
-        agent.add_env_feedback("Scheduled order: " + ", ".join(names))
+        feedback = "Scheduled order: " + ", ".join(names)
+        if unknown:
+            feedback += " (unknown, not scheduled: " + ", ".join(unknown) + ")"
+        agent.add_env_feedback(feedback)
         return True, {"scheduled": names}, f"{agent.name} scheduled: {','.join(names)}", {}, False
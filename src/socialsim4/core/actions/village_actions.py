@@ -1,3 +1,6 @@
+import heapq
+from operator import itemgetter
+
 from socialsim4.core.action import Action
 from socialsim4.core.agent import Agent
 from socialsim4.core.scene import Scene
@@ -17,14 +20,14 @@ class MoveToLocationAction(Action):
         """Move to a location or coordinates using grid pathfinding and terrain costs."""
         # Resolve start
         start_xy = agent.properties.get("map_xy")
-        target_xy = None
+        start = (start_xy[0], start_xy[1])
         target_location = action_data.get("location")
         if target_location:
             loc = scene.game_map.get_location(target_location)
             if not loc:
                 agent.add_env_feedback(f"Location '{target_location}' does not exist.")
                 return False, {"error": "unknown_location", "location": target_location}, f"{agent.name} move failed", {}, False
-            target_xy = [loc.x, loc.y]
+            target = (loc.x, loc.y)
         else:
             tx, ty = action_data["x"], action_data["y"]
             if tx is None or ty is None:
@@ -32,25 +35,25 @@ class MoveToLocationAction(Action):
                     "Provide a target 'location' or coordinates 'x' and 'y'."
                 )
                 return False, {"error": "missing_target"}, f"{agent.name} move failed", {}, False
-            target_xy = [int(tx), int(ty)]
+            target = (int(tx), int(ty))
+        target_xy = [target[0], target[1]]
 
-        if start_xy[0] == target_xy[0] and start_xy[1] == target_xy[1]:
+        if start == target:
             agent.add_env_feedback("You are already at the target.")
             return False, {"error": "already_there", "to": target_xy}, f"{agent.name} move skipped", {}, False
 
         # Pathfinding
-        path = scene.game_map.find_path(tuple(start_xy), tuple(target_xy))
+        path, base_cost = scene.game_map.find_route(start, target)
         if not path:
             agent.add_env_feedback("No reachable path; possibly blocked by obstacles.")
             return False, {"error": "no_path", "to": target_xy}, f"{agent.name} move failed", {}, False
 
-        # Compute energy cost: sum of tile movement_cost entering each tile, scaled
-        base_cost = scene.game_map.path_cost(path)
+        # Energy cost: base_cost sums tile movement_cost entering each tile, scaled
         energy_cost = max(1, int(base_cost * scene.movement_cost))
 
         if agent.properties["energy"] < energy_cost:
             agent.add_env_feedback(
-                f"Not enough energy. Moving to {tuple(target_xy)} costs {energy_cost}, you have {agent.properties['energy']}."
+                f"Not enough energy. Moving to {target} costs {energy_cost}, you have {agent.properties['energy']}."
             )
             return False, {"error": "low_energy", "required": energy_cost, "have": agent.properties["energy"]}, f"{agent.name} move failed", {}, False
 
@@ -76,24 +79,19 @@ class MoveToLocationAction(Action):
             if new_loc
             else scene.game_map.get_tile(*target_xy).terrain
         )
-        agent.add_env_feedback(f"You arrived at {tuple(target_xy)}. {desc}")
+        agent.add_env_feedback(f"You arrived at {target}. {desc}")
 
         # Nearby agents at destination
-        nearby = []
-        for other in simulator.agents.values():
-            if other.name == agent.name:
-                continue
-            oxy = other.properties.get("map_xy")
-            if oxy:
-                dist = abs(oxy[0] - target_xy[0]) + abs(oxy[1] - target_xy[1])
-                if dist <= scene.chat_range:
-                    nearby.append(f"{other.name} (distance {dist})")
+        nearby = scene.agents_within(simulator, target_xy, scene.chat_range, agent.name)
         if nearby:
-            agent.add_env_feedback("Nearby agents: " + ", ".join(nearby))
+            agent.add_env_feedback(
+                "Nearby agents: "
+                + ", ".join(f"{name} (distance {dist})" for dist, name in nearby)
+            )
 
         # No logging here; central processing can consume result/summary
-        result = {"from": start_xy, "to": target_xy, "energy_cost": energy_cost, "path": path}
-        summary = f"{agent.name} moved to {tuple(target_xy)} (energy {energy_cost})"
+        result = {"from": start_xy, "to": target_xy, "energy_cost": energy_cost, "path": list(path)}
+        summary = f"{agent.name} moved to {target} (energy {energy_cost})"
         return True, result, summary, {}, False
 
 
@@ -137,28 +135,18 @@ class LookAroundAction(Action):
         )
         if nearby_locations:
             info.append("Nearby locations:")
+            x0, y0 = xy
             for loc in nearby_locations[:8]:
-                dist = abs(loc.x - xy[0]) + abs(loc.y - xy[1])
+                dist = abs(loc.x - x0) + abs(loc.y - y0)
                 if dist == 0:
                     continue
                 info.append(f"  - {loc.name} (distance: {dist}) - {loc.description}")
 
-        # Nearby agents
-        nearby_agents = []
-        for other in simulator.agents.values():
-            if other.name == agent.name:
-                continue
-            oxy = other.properties.get("map_xy")
-            if not oxy:
-                continue
-            dist = abs(oxy[0] - xy[0]) + abs(oxy[1] - xy[1])
-            if dist <= radius:
-                nearby_agents.append((dist, other.name))
+        # Nearby agents: ten closest, ties in agent order
+        nearby_agents = scene.agents_within(simulator, xy, radius, agent.name)
         if nearby_agents:
-            nearby_agents.sort(key=lambda x: x[0])
-            agents_str = ", ".join(
-                [f"{name}({dist})" for dist, name in nearby_agents[:10]]
-            )
+            closest = heapq.nsmallest(10, nearby_agents, key=itemgetter(0))
+            agents_str = ", ".join(f"{name}({dist})" for dist, name in closest)
             info.append(f"Nearby agents: {agents_str}")
 
         agent.add_env_feedback("\n".join(info))
@@ -217,12 +205,13 @@ class GatherResourceAction(Action):
         else:
             loc.resources[resource_type] -= actual_amount
 
-        agent.properties["inventory"][resource_type] = (
-            agent.properties["inventory"].get(resource_type, 0) + actual_amount
-        )
+        inventory = agent.properties["inventory"]
+        inventory[resource_type] = inventory.get(resource_type, 0) + actual_amount
 
+        # Only the changed item: the full inventory is already in the status prompt
         agent.add_env_feedback(
-            f"You gathered {actual_amount} {resource_type}. Inventory: {agent.properties['inventory']}"
+            f"You gathered {actual_amount} {resource_type}. You now hold "
+            f"{inventory[resource_type]} {resource_type} ({sum(inventory.values())} items total)."
         )
         # No logging here; central processing can consume result/summary
         result = {"resource": resource_type, "amount": actual_amount, "source": source, "position": xy}
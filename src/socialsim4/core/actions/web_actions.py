@@ -5,6 +5,8 @@ import httpx
 from socialsim4.core.action import Action
 from socialsim4.core.tools.web import view_page as tool_view_page
 
+_WS_RE = re.compile(r"\s+")
+
 
 class WebSearchAction(Action):
     NAME = "web_search"
@@ -36,7 +38,7 @@ class WebSearchAction(Action):
             url = r.get("url", "").strip()
             snippet = r.get("snippet", "").strip()
             if snippet:
-                snippet = re.sub(r"\s+", " ", snippet)
+                snippet = _WS_RE.sub(" ", snippet)
             lines.append(f"{i}. {title} - {url}")
             if snippet:
                 lines.append(f"   {snippet}")
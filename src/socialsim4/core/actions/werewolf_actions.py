@@ -1,23 +1,47 @@
+from collections import Counter
+from functools import wraps
 from typing import Optional
 
-from socialsim4.core.action import Action
+from socialsim4.core.action import Action, fail_action
 from socialsim4.core.event import PublicEvent
 
 
 def _is_alive(scene, name: str) -> bool:
-    return name in scene.state.get("alive", [])
+    return scene._is_alive(name)
 
 
 def _role_of(scene, name: str) -> Optional[str]:
     return scene.state.get("roles", {}).get(name)
 
 
+def requires(*, phase_msg: str, role_error: str, role_msg: str):
+    """Guard a role handler: the class's PHASE, then a living agent holding its ROLE.
+
+    Reads scene.state once; failures keep each action's own error key and text.
+    """
+
+    def deco(handle):
+        @wraps(handle)
+        def wrapped(self, action_data, agent, simulator, scene):
+            st = scene.state
+            if st.get("phase") != self.PHASE:
+                return fail_action(agent, self.NAME, "wrong_phase", phase_msg)
+            if agent.name not in st["alive"] or st["roles"].get(agent.name) != self.ROLE:
+                return fail_action(agent, self.NAME, role_error, role_msg)
+            return handle(self, action_data, agent, simulator, scene)
+
+        return wrapped
+
+    return deco
+
+
 class VoteLynchAction(Action):
     NAME = "vote_lynch"
     DESC = "During the day, vote to lynch a player. One vote per day."
     INSTRUCTION = """- To vote to lynch someone during the day:
 <Action name=\"vote_lynch\"><target>[player_name]</target></Action>
 """
+    PHASE = "day_voting"
 
     def handle(self, action_data, agent, simulator, scene):
         if scene.state.get("phase") != "day_voting":
@@ -49,9 +73,9 @@ class VoteLynchAction(Action):
                 False,
             )
 
-        votes = scene.state.setdefault("lynch_votes", {})
+        votes = scene.state["lynch_votes"]
         votes[agent.name] = target
-        tally = sum(1 for v, t in votes.items() if t == target and _is_alive(scene, v))
+        tally = Counter(votes.values())[target]
         simulator.broadcast(PublicEvent(f"{agent.name} voted to lynch {target}."))
         result = {"target": target, "tally": tally}
         summary = f"{agent.name} voted to lynch {target}"
@@ -64,22 +88,15 @@ class NightKillAction(Action):
     INSTRUCTION = """- Werewolves: to vote a night kill target (at night only):
 <Action name=\"night_kill\"><target>[player_name]</target></Action>
 """
-
+    PHASE = "night"
+    ROLE = "werewolf"
+
+    @requires(
+        phase_msg="Night kill can only be cast at night.",
+        role_error="not_werewolf_or_dead",
+        role_msg="Only living werewolves can vote a night kill.",
+    )
     def handle(self, action_data, agent, simulator, scene):
-        if scene.state.get("phase") != "night":
-            agent.add_env_feedback("Night kill can only be cast at night.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} night_kill failed", {}, False
-        if (not _is_alive(scene, agent.name)) or _role_of(
-            scene, agent.name
-        ) != "werewolf":
-            agent.add_env_feedback("Only living werewolves can vote a night kill.")
-            return (
-                False,
-                {"error": "not_werewolf_or_dead"},
-                f"{agent.name} night_kill failed",
-                {},
-                False,
-            )
         if scene.state.get("day_count", 0) == 0:
             agent.add_env_feedback(
                 "First night has no kills; discuss with fellow wolves."
@@ -94,26 +111,21 @@ class NightKillAction(Action):
             agent.add_env_feedback("Provide a living non-werewolf 'target'.")
             return False, {"error": "invalid_target"}, f"{agent.name} night_kill failed", {}, False
 
-        votes = scene.state.setdefault("night_kill_votes", {})
+        votes = scene.state["night_kill_votes"]
         votes[agent.name] = target
+        tally = Counter(votes.values())[target]
         # Private confirmation
         # agent.add_env_feedback(f"Night kill vote recorded: {target}.")
         wolves = [
             name
-            for name in scene.state.get("roles")
-            if _role_of(scene, name) == "werewolf"
+            for name, role in scene.state["roles"].items()
+            if role == "werewolf"
         ]
         receivers = wolves + scene.moderator_names
         simulator.broadcast(
             PublicEvent(f"{agent.name} voted night kill to {target}.", prefix="Event"),
             receivers=receivers,
         )
-        # Tally only werewolf votes
-        tally = sum(
-            1
-            for v, t in votes.items()
-            if t == target and _is_alive(scene, v) and _role_of(scene, v) == "werewolf"
-        )
         result = {"target": target, "tally": tally}
         summary = f"{agent.name} voted night kill: {target}"
         return True, result, summary, {}, True
@@ -125,14 +137,15 @@ class InspectAction(Action):
     INSTRUCTION = """- Seer: to inspect a player at night:
 <Action name=\"inspect\"><target>[player_name]</target></Action>
 """
-
+    PHASE = "night"
+    ROLE = "seer"
+
+    @requires(
+        phase_msg="You can only inspect at night.",
+        role_error="not_seer_or_dead",
+        role_msg="Only a living Seer can inspect.",
+    )
     def handle(self, action_data, agent, simulator, scene):
-        if scene.state.get("phase") != "night":
-            agent.add_env_feedback("You can only inspect at night.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} inspect failed", {}, False
-        if not _is_alive(scene, agent.name) or _role_of(scene, agent.name) != "seer":
-            agent.add_env_feedback("Only a living Seer can inspect.")
-            return False, {"error": "not_seer_or_dead"}, f"{agent.name} inspect failed", {}, False
         target = action_data.get("target")
         if not target or not _is_alive(scene, target):
             agent.add_env_feedback("Provide a living 'target' to inspect.")
@@ -163,20 +176,15 @@ class WitchSaveAction(Action):
     INSTRUCTION = """- Witch: to save tonight's victim (once per game):
 <Action name=\"witch_save\" />
 """
-
+    PHASE = "night"
+    ROLE = "witch"
+
+    @requires(
+        phase_msg="You can only use save at night.",
+        role_error="not_witch_or_dead",
+        role_msg="Only a living Witch can save.",
+    )
     def handle(self, action_data, agent, simulator, scene):
-        if scene.state.get("phase") != "night":
-            agent.add_env_feedback("You can only use save at night.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} witch_save failed", {}, False
-        if not _is_alive(scene, agent.name) or _role_of(scene, agent.name) != "witch":
-            agent.add_env_feedback("Only a living Witch can save.")
-            return (
-                False,
-                {"error": "not_witch_or_dead"},
-                f"{agent.name} witch_save failed",
-                {},
-                False,
-            )
 
         uses = scene.state.setdefault("witch_uses", {}).setdefault(
             agent.name, {"heals_left": 1, "poisons_left": 1}
@@ -204,20 +212,15 @@ class WitchPoisonAction(Action):
     INSTRUCTION = """- Witch: to poison a player at night (once per game):
 <Action name=\"witch_poison\"><target>[player_name]</target></Action>
 """
-
+    PHASE = "night"
+    ROLE = "witch"
+
+    @requires(
+        phase_msg="You can only poison at night.",
+        role_error="not_witch_or_dead",
+        role_msg="Only a living Witch can poison.",
+    )
     def handle(self, action_data, agent, simulator, scene):
-        if scene.state.get("phase") != "night":
-            agent.add_env_feedback("You can only poison at night.")
-            return False, {"error": "wrong_phase"}, f"{agent.name} witch_poison failed", {}, False
-        if not _is_alive(scene, agent.name) or _role_of(scene, agent.name) != "witch":
-            agent.add_env_feedback("Only a living Witch can poison.")
-            return (
-                False,
-                {"error": "not_witch_or_dead"},
-                f"{agent.name} witch_poison failed",
-                {},
-                False,
-            )
         target = action_data.get("target")
         if not target or not _is_alive(scene, target) or target == agent.name:
             agent.add_env_feedback("Provide a living 'target' other than yourself.")
@@ -1,13 +1,55 @@
 import json
+import logging
 import re
 import xml.etree.ElementTree as ET
+from typing import Optional
 
-from socialsim4.core.config import MAX_REPEAT
+from socialsim4.core.action import assemble_catalog, assemble_instructions
+from socialsim4.core.config import MAX_REPEAT, SUMMARY_THRESHOLD
 from socialsim4.core.memory import ShortTermMemory
 
-# 假设的最大上下文字符长度（可调整，根据模型实际上下文窗口）
-MAX_CONTEXT_CHARS = 100000000
-SUMMARY_THRESHOLD = int(MAX_CONTEXT_CHARS * 0.7)  # 70% 阈值
+logger = logging.getLogger(__name__)
+
+# Response parsing patterns (run once per agent turn)
+_SUMMARY_RE = re.compile(r"Summary: (.*)", re.DOTALL)
+_ACTION_BLOCK_RE = re.compile(r"<Action.*?>.*</Action>", re.DOTALL)
+_ACTION_SELF_CLOSING_RE = re.compile(r"<Action.*?/>", re.DOTALL)
+# Childless action (e.g. yield): the whole block is one name-only element
+_BARE_ACTION_RE = re.compile(r'<Action\s+name="([^"<>&]+)"\s*(?:/>|>\s*</Action>)\s*$')
+_NUMBERED_LINE_RE = re.compile(r"^(\d+)\.\s*(.*)$")
+# Bare '&' not starting an entity/char reference
+_AMP_RE = re.compile(r"&(?!#\d+;|#x[0-9A-Fa-f]+;|[A-Za-z][A-Za-z0-9]*;)")
+
+
+def _section(text: str, start: str, end: Optional[str] = None, open_ended: bool = True) -> str:
+    """Stripped text between the first `start` marker and the next `end` marker.
+
+    A missing (or None) `end` runs to the end of text when open_ended, else the
+    section is empty. A missing `start` always yields "".
+    """
+    i = text.find(start)
+    if i < 0:
+        return ""
+    i += len(start)
+    j = text.find(end, i) if end is not None else -1
+    if j < 0:
+        if not open_ended:
+            return ""
+        j = len(text)
+    return text[i:j].strip()
+
+
+def _copy_plan_state(plan: dict) -> dict:
+    """Copy of a plan_state: fresh goal/milestone dicts; other values are strings."""
+    return {
+        **plan,
+        "goals": [dict(g) for g in plan.get("goals", [])],
+        "milestones": [dict(m) for m in plan.get("milestones", [])],
+    }
+
+
+def _copy_memory(history) -> list:
+    return [{"role": m.get("role"), "content": m.get("content")} for m in history]
 
 
 class Agent:
@@ -109,8 +151,10 @@ Internal Notes:
             plan_state_block += "\nPlan State is empty. In this turn, include a plan update block using tags to initialize numbered Goals and Milestones.\n"
 
         # Build action catalog and usage
-        action_catalog = "\n".join([f"- {getattr(action, 'NAME', '')}: {getattr(action, 'DESC', '')}".strip() for action in self.action_space])
-        action_instructions = "".join(getattr(action, "INSTRUCTION", "") for action in self.action_space)
+        actions = scene.get_available_actions(self) if scene else self.action_space
+        action_types = tuple(type(action) for action in actions)
+        action_catalog = assemble_catalog(action_types)
+        action_instructions = assemble_instructions(action_types)
         examples_block = ""
         if scene and scene.get_examples():
             examples_block = f"Here are some examples:\n{scene.get_examples()}"
@@ -232,7 +276,7 @@ Emotion Update Rules:
         # Delegate timeout/retry logic to the client implementation
         return client.chat(messages)
 
-    def summarize_history(self, client):
+    def summarize_history(self, clients):
         # 构建总结prompt
         history_content = "\n".join([f"[{msg['role']}] {msg['content']}" for msg in self.short_memory.get_all()])
         summary_prompt = f"""
@@ -244,10 +288,10 @@ History:
 
         # 为总结调用LLM（使用简单messages）
         messages = [{"role": "user", "content": summary_prompt}]
-        summary_output = self.call_llm(client, messages)
+        summary_output = self.call_llm(clients, messages)
 
         # 提取总结（假设模型遵循格式）
-        summary_match = re.search(r"Summary: (.*)", summary_output, re.DOTALL)
+        summary_match = _SUMMARY_RE.search(summary_output)
         if summary_match:
             summary = summary_match.group(1).strip()
         else:
@@ -256,29 +300,16 @@ History:
         # 替换personal_history：用总结作为新的user消息起点
         self.short_memory.clear()
         self.short_memory.append("user", f"Summary: {summary}")
-        print(f"{self.name} summarized history.")
+        logger.debug("%s summarized history.", self.name)
 
     def _parse_full_response(self, full_response):
         """Extracts thoughts, plan, action block, and optional plan update from the response."""
-        thoughts_match = re.search(r"--- Thoughts ---\s*(.*?)\s*--- Plan ---", full_response, re.DOTALL)
-        plan_match = re.search(r"--- Plan ---\s*(.*?)\s*--- Action ---", full_response, re.DOTALL)
-        action_match = re.search(
-            r"--- Action ---\s*(.*?)(?:\n--- Plan Update ---|\Z)",
-            full_response,
-            re.DOTALL,
-        )
-        plan_update_match = re.search(
-            r"--- Plan Update ---\s*(.*?)(?:\n--- Emotion Update ---|\Z)",
-            full_response,
-            re.DOTALL,
-        )
-        emotion_update_match = re.search(r"--- Emotion Update ---\s*(.*)$", full_response, re.DOTALL)
-
-        thoughts = thoughts_match.group(1).strip() if thoughts_match else ""
-        plan = plan_match.group(1).strip() if plan_match else ""
-        action = action_match.group(1).strip() if action_match else ""
-        plan_update_block = plan_update_match.group(1).strip() if plan_update_match else ""
-        emotion_update_block = emotion_update_match.group(1).strip() if emotion_update_match else ""
+        # Plain marker finds; each section ends at the next marker in order
+        thoughts = _section(full_response, "--- Thoughts ---", "--- Plan ---", open_ended=False)
+        plan = _section(full_response, "--- Plan ---", "--- Action ---", open_ended=False)
+        action = _section(full_response, "--- Action ---", "\n--- Plan Update ---")
+        plan_update_block = _section(full_response, "--- Plan Update ---", "\n--- Emotion Update ---")
+        emotion_update_block = _section(full_response, "--- Emotion Update ---")
 
         return thoughts, plan, action, plan_update_block, emotion_update_block
 
@@ -304,11 +335,7 @@ History:
             return None
         xml_text = "<Update>" + text + "</Update>"
         # Normalize bare ampersands so XML parser won't choke on plain '&'
-        xml_text = re.sub(
-            r"&(?!#\d+;|#x[0-9A-Fa-f]+;|[A-Za-z][A-Za-z0-9]*;)",
-            "&amp;",
-            xml_text,
-        )
+        xml_text = _AMP_RE.sub("&amp;", xml_text)
         root = ET.fromstring(xml_text)
         if root.tag != "Update":
             return None
@@ -336,7 +363,7 @@ History:
             items = []
             lines = [l.strip() for l in (txt or "").splitlines() if l.strip()]
             for l in lines:
-                m = re.match(r"^(\d+)\.\s*(.*)$", l)
+                m = _NUMBERED_LINE_RE.match(l)
                 if not m:
                     raise ValueError("Malformed Plan Update list line: " + l)
                 items.append(m.group(2).strip())
@@ -456,8 +483,8 @@ History:
         text = action_block.strip()
         # Strip the content before < and after >
         # help me write it: Strip the content before < and after >
-        m1 = re.search(r"<Action.*?>.*</Action>", text, re.DOTALL)
-        m2 = re.search(r"<Action.*?/>", text, re.DOTALL)
+        m1 = _ACTION_BLOCK_RE.search(text)
+        m2 = _ACTION_SELF_CLOSING_RE.search(text)
         m = m1 or m2
         if m:
             text = m.group(0).strip()
@@ -473,12 +500,13 @@ History:
             text = text.strip("`")
         text = text.strip("`")
 
+        # Fast path: no children to collect, so skip the XML parse
+        bare = _BARE_ACTION_RE.match(text)
+        if bare:
+            return [{"action": bare.group(1)}]
+
         # Normalize bare ampersands so XML parser won't choke on plain '&'
-        text = re.sub(
-            r"&(?!#\d+;|#x[0-9A-Fa-f]+;|[A-Za-z][A-Za-z0-9]*;)",
-            "&amp;",
-            text,
-        )
+        text = _AMP_RE.sub("&amp;", text)
 
         # Parse as a single Action element
         root = ET.fromstring(text)
@@ -507,11 +535,14 @@ History:
             # 没有新事件，无反应
             return {}
 
+        # Keep the context bounded: fold long histories into a summary first
+        if self.short_memory.chars > SUMMARY_THRESHOLD:
+            self.summarize_history(clients)
+
         system_prompt = self.system_prompt(scene)
 
-        # Get history from memory
-        ctx = self.short_memory.searilize(dialect="default")
-        ctx.insert(0, {"role": "system", "content": system_prompt})
+        # System prompt first, then history from memory
+        ctx = [{"role": "system", "content": system_prompt}, *self.short_memory.searilize(dialect="default")]
 
         # Non-ephemeral action-only nudge for intra-turn calls or when last was assistant
         last_role = ctx[-1].get("role") if len(ctx) > 1 else None
@@ -592,17 +623,18 @@ History:
                 if getattr(self, "is_offline", False):
                     break
                 if i < attempts - 1:
-                    # 打印一下方便本地调试
-                    print(
-                        f"{self.name} action parse error: {e}; retry {i + 1}/{attempts - 1}..."
+                    # 调试日志（默认级别下不输出）
+                    logger.debug(
+                        "%s action parse error: %s; retry %d/%d...", self.name, e, i + 1, attempts - 1
                     )
                     continue
                 # 最后一次解析也失败，跳出循环（success 仍为 False）
-                print(
-                    f"{self.name} action parse error after {attempts} attempts: {e}"
-                )
-                print(
-                    f"LLM output (last):\n{llm_output}\n{'-' * 40}"
+                logger.warning(
+                    "%s action parse error after %d attempts: %s\nLLM output (last):\n%s",
+                    self.name,
+                    attempts,
+                    e,
+                    llm_output,
                 )
                 break
 
@@ -645,9 +677,10 @@ History:
 
     def serialize(self):
         # Deep-copy dict/list fields to avoid sharing across snapshots
-        mem = [{"role": m.get("role"), "content": m.get("content")} for m in self.short_memory.get_all()]
+        # Structural copies for memory/plan (known shapes); properties are free-form
+        mem = _copy_memory(self.short_memory.get_all())
         props = json.loads(json.dumps(self.properties))
-        plan = json.loads(json.dumps(self.plan_state))
+        plan = _copy_plan_state(self.plan_state)
         return {
             "name": self.name,
             "user_profile": self.user_profile,
@@ -711,23 +744,10 @@ History:
         agent.emotion_enabled = bool(props.get("emotion_enabled", False))
 
         # 恢复记忆、计划等
-        agent.short_memory.history = json.loads(
-            json.dumps(data.get("short_memory", []))
-        )
+        agent.short_memory.load(_copy_memory(data.get("short_memory", [])))
         agent.last_history_length = data.get("last_history_length", 0)
-        agent.plan_state = json.loads(
-            json.dumps(
-                data.get(
-                    "plan_state",
-                    {
-                        "goals": [],
-                        "milestones": [],
-                        "strategy": "",
-                        "notes": "",
-                    },
-                )
-            )
-        )
+        if "plan_state" in data:
+            agent.plan_state = _copy_plan_state(data["plan_state"])
 
         # ---- NEW: 恢复 LLM 错误状态 ----
         agent.consecutive_llm_errors = data.get("consecutive_llm_errors", 0)
@@ -6,6 +6,12 @@ Prototype-stage: minimal globals toggled at simulation build time.
 # LLM retry attempts per action parse (1 + MAX_REPEAT total attempts)
 MAX_REPEAT = 3
 
+# Short-term memory budget in characters of message content. Once the running
+# total passes SUMMARY_THRESHOLD the agent summarizes its history before the
+# next LLM call (~28k chars, roughly 7k tokens).
+MAX_CONTEXT_CHARS = 40000
+SUMMARY_THRESHOLD = int(MAX_CONTEXT_CHARS * 0.7)  # 70% 阈值
+
 # Emotion tracking toggle. When true, agents include an Emotion Update block
 # each turn and the system records `emotion_update` events.
 EMOTION_ENABLED = False
@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
 def _fmt_time_prefix(time_val):
     if time_val is None:
         return ""
@@ -8,6 +12,8 @@ def _fmt_time_prefix(time_val):
 
 
 class Event:
+    __slots__ = ()
+
     def to_string(self, time=None):
         raise NotImplementedError
 
@@ -16,6 +22,8 @@ class Event:
 
 
 class MessageEvent(Event):
+    __slots__ = ("sender", "message")
+
     def __init__(self, sender, message):
         self.sender = sender
         self.message = message
@@ -29,6 +37,8 @@ class MessageEvent(Event):
 
 
 class PublicEvent(Event):
+    __slots__ = ("content", "prefix")
+
     def __init__(self, content, prefix="Public Event"):
         self.content = content
         self.prefix = prefix
@@ -39,6 +49,8 @@ class PublicEvent(Event):
 
 
 class NewsEvent(Event):
+    __slots__ = ("content",)
+
     def __init__(self, content):
         self.content = content
 
@@ -48,6 +60,8 @@ class NewsEvent(Event):
 
 
 class StatusEvent(Event):
+    __slots__ = ("status_data",)
+
     def __init__(self, status_data):
         self.status_data = status_data
 
@@ -57,6 +71,8 @@ class StatusEvent(Event):
 
 
 class SpeakEvent(Event):
+    __slots__ = ("sender", "message")
+
     def __init__(self, sender, message):
         self.sender = sender
         self.message = message
@@ -71,6 +87,8 @@ class SpeakEvent(Event):
 
 
 class TalkToEvent(Event):
+    __slots__ = ("sender", "recipient", "message")
+
     def __init__(self, sender, recipient, message):
         self.sender = sender
         self.recipient = recipient
@@ -1,31 +1,118 @@
+import hashlib
+import json
 import os
+import random
 import re
 import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutTimeout
-from threading import BoundedSemaphore
-from copy import deepcopy
-
-import google.generativeai as genai
-from openai import OpenAI
+from threading import BoundedSemaphore, Lock
+from dataclasses import replace
+from functools import lru_cache
 
 from .llm_config import LLMConfig
 
 
+# The provider SDKs (openai, google.generativeai) take about a second to import,
+# so they are imported on first use; mock-only runs never load them.
+
+# Transient failures worth retrying; anything else (bad request, auth, config or
+# programming errors) is raised on the first attempt.
+_BASE_RETRIABLE = (FutTimeout, ConnectionError, TimeoutError)
+# Upper bound for a single backoff sleep
+_MAX_BACKOFF_S = 30.0
+
+
+@lru_cache(maxsize=None)
+def _retriable_errors(dialect: str) -> tuple:
+    if dialect == "openai":
+        import openai
+
+        return _BASE_RETRIABLE + (
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        )
+    if dialect == "gemini":
+        from google.api_core import exceptions as google_exceptions
+
+        return _BASE_RETRIABLE + (
+            google_exceptions.ServerError,
+            google_exceptions.ResourceExhausted,
+        )
+    return _BASE_RETRIABLE
+
+
+# One HTTP connection pool (SDK default limits) shared by every OpenAI client and
+# clone, so branches reuse keep-alive connections instead of new TLS handshakes.
+@lru_cache(maxsize=None)
+def _openai_http_client():
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient()
+
+
+# genai.configure is process-global; GenerativeModel is immutable config.
+# Configure only when the key changes and reuse one model object per (key, model).
+_GEMINI_MODELS = {}
+_gemini_lock = Lock()
+_gemini_configured_key = None
+
+
+def _gemini_model(api_key: str, model: str):
+    global _gemini_configured_key
+    import google.generativeai as genai
+
+    with _gemini_lock:
+        if api_key != _gemini_configured_key:
+            genai.configure(api_key=api_key)
+            _gemini_configured_key = api_key
+        key = (api_key, model)
+        if key not in _GEMINI_MODELS:
+            _GEMINI_MODELS[key] = genai.GenerativeModel(model)
+        return _GEMINI_MODELS[key]
+
+
+def _make_client(provider: LLMConfig):
+    """Underlying SDK client (or mock model) for provider.dialect."""
+    if provider.dialect == "openai":
+        from openai import OpenAI
+
+        return OpenAI(
+            api_key=provider.api_key,
+            base_url=provider.base_url,
+            http_client=_openai_http_client(),
+        )
+    if provider.dialect == "gemini":
+        return _gemini_model(provider.api_key, provider.model)
+    if provider.dialect == "mock":
+        return _MockModel()
+    raise ValueError(f"Unknown LLM provider dialect: {provider.dialect}")
+
+
+# Chat roles forwarded to providers; Gemini has no system role in contents
+_CHAT_ROLES = ("system", "user", "assistant")
+_GEMINI_ROLE = {"system": "user", "user": "user", "assistant": "model"}
+
+
+def _messages_key(messages) -> str:
+    """Digest of the role/content sequence a chat call actually sends."""
+    payload = json.dumps([(m["role"], m["content"]) for m in messages], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# A complete <Action .../> or <Action ...>...</Action> element
+_CACHEABLE_REPLY_RE = re.compile(r"<Action\b.*?(?:/>|</Action>)", re.DOTALL)
+
+
 class LLMClient:
     def __init__(self, provider: LLMConfig):
         self.provider = provider
 
         # 根据 dialect 初始化底层 client
-        if provider.dialect == "openai":
-            self.client = OpenAI(api_key=provider.api_key, base_url=provider.base_url)
-        elif provider.dialect == "gemini":
-            genai.configure(api_key=provider.api_key)
-            self.client = genai.GenerativeModel(provider.model)
-        elif provider.dialect == "mock":
-            self.client = _MockModel()
-        else:
-            raise ValueError(f"Unknown LLM provider dialect: {provider.dialect}")
+        self.client = _make_client(provider)
+        self._retriable = _retriable_errors(provider.dialect)
 
         # Timeout and retry settings (environment-driven defaults)
         self.timeout_s = float(os.getenv("LLM_TIMEOUT_S", "30"))
@@ -37,6 +124,14 @@ class LLMClient:
         if max_concurrent < 1:
             max_concurrent = 1
         self._sem = BoundedSemaphore(max_concurrent)
+        # 复用的超时执行线程池（非 openai 调用用它来实现 future.timeout）
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="llm")
+
+        # Exact-match response cache (LRU); 0 disables. Off by default because
+        # a hit replays one sampled completion instead of drawing a new one.
+        self.response_cache_size = int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "0"))
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = Lock()
 
     # ----------- 新增：用于“强隔离模式”的 clone 方法 -----------
     def clone(self) -> "LLMClient":
@@ -44,42 +139,39 @@ class LLMClient:
         为 LLMClientPool 的“强隔离模式”提供支持：创建一个
         “功能等价但完全独立”的 LLMClient 实例。
 
-        - provider 使用 deepcopy，避免后续修改互相影响；
-        - 底层 OpenAI/Gemini/Mock 客户端重新初始化（新连接）；
+        - provider 复制一份（字段都是不可变标量，浅拷贝即可），避免后续修改互相影响；
+        - 底层 OpenAI/Mock 客户端重新初始化（OpenAI 共用同一个 HTTP 连接池）；
+          Gemini 复用同一 (api_key, model) 的 GenerativeModel（不可变配置）；
         - timeout / retries / backoff 从当前实例继承；
         - semaphore 独立，避免并发配额互相影响。
         """
-        # 1. 深拷贝 provider 配置
-        cloned_provider = deepcopy(self.provider)
+        # 1. 复制 provider 配置
+        cloned_provider = replace(self.provider)
 
         # 2. 构造一个“空壳”实例（绕过 __init__，手动赋值）
         cloned = LLMClient.__new__(LLMClient)
         cloned.provider = cloned_provider
 
         # 3. 重新初始化底层 client
-        if cloned_provider.dialect == "openai":
-            cloned.client = OpenAI(
-                api_key=cloned_provider.api_key,
-                base_url=cloned_provider.base_url,
-            )
-        elif cloned_provider.dialect == "gemini":
-            genai.configure(api_key=cloned_provider.api_key)
-            cloned.client = genai.GenerativeModel(cloned_provider.model)
-        elif cloned_provider.dialect == "mock":
-            cloned.client = _MockModel()
-        else:
-            raise ValueError(f"Unknown LLM provider dialect: {cloned_provider.dialect}")
+        cloned.client = _make_client(cloned_provider)
+        cloned._retriable = self._retriable
 
         # 4. 继承调用策略配置
         cloned.timeout_s = self.timeout_s
         cloned.max_retries = self.max_retries
         cloned.retry_backoff_s = self.retry_backoff_s
 
-        # 5. 为 clone 分配独立 semaphore
+        # 5. 为 clone 分配独立 semaphore 与线程池
         max_concurrent = int(os.getenv("LLM_MAX_CONCURRENT_PER_CLIENT", "8"))
         if max_concurrent < 1:
             max_concurrent = 1
         cloned._sem = BoundedSemaphore(max_concurrent)
+        cloned._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="llm")
+
+        # 6. 独立（空）的响应缓存
+        cloned.response_cache_size = self.response_cache_size
+        cloned._response_cache = OrderedDict()
+        cloned._response_cache_lock = Lock()
 
         return cloned
 
@@ -89,7 +181,7 @@ class LLMClient:
         对单次 LLM 调用做：
         - 并发限流（每个 client 有自己的 semaphore）
         - 超时控制（非 openai 通过线程 + future.timeout，openai 靠 SDK timeout）
-        - 重试 + 指数退避
+        - 仅对 self._retriable 中的瞬时错误重试 + 带抖动的指数退避（上限 _MAX_BACKOFF_S）
 
         注意：fn() 本身不应捕获最终异常，否则 retry 机制无法生效。
         """
@@ -103,22 +195,23 @@ class LLMClient:
                         # OpenAI: 直接调用，超时交给 SDK 的 timeout 参数
                         result = fn()
                     else:
-                        # 其他（如 Gemini）：用线程强制执行超时
-                        with ThreadPoolExecutor(max_workers=1) as ex:
-                            fut = ex.submit(fn)
-                            result = fut.result(timeout=self.timeout_s)
+                        # 其他（如 Gemini）：在共享线程池里执行，用 future.timeout 强制超时；
+                        # 超时的调用留在后台结束，不会阻塞本次返回
+                        result = self._executor.submit(fn).result(timeout=self.timeout_s)
                 # 调用成功，直接返回结果，结束重试循环
                 return result
-            except (FutTimeout, Exception) as e:
+            except self._retriable as e:
                 last_err = e
                 # 如果还有剩余重试次数，做指数退避
                 if attempt < self.max_retries:
+                    # 抖动：避免并发调用方同步重试
+                    wait = min(_MAX_BACKOFF_S, delay * (0.5 + random.random()))
                     # 这里你可以改成 logger.warning(...)，现在先简单 print
                     print(
                         f"[LLMClient] call failed (attempt {attempt + 1}/{self.max_retries + 1}): "
-                        f"{repr(e)}; sleep {delay:.2f}s then retry..."
+                        f"{repr(e)}; sleep {wait:.2f}s then retry..."
                     )
-                    time.sleep(max(0.0, delay))
+                    time.sleep(wait)
                     delay *= 2
                     continue
                 # 用尽重试次数，抛出最后一次的异常
@@ -126,14 +219,38 @@ class LLMClient:
 
     # ----------- Chat API -----------
     def chat(self, messages):
+        if self.response_cache_size <= 0:
+            return self._chat(messages)
+        key = _messages_key(messages)
+        with self._response_cache_lock:
+            hit = self._response_cache.get(key)
+            if hit is not None:
+                self._response_cache.move_to_end(key)
+                return hit
+        text = self._chat(messages)
+        # Only replies carrying an action block are cached: one the agent
+        # cannot parse is retried with the same messages and must resample.
+        if text and _CACHEABLE_REPLY_RE.search(text):
+            with self._response_cache_lock:
+                self._response_cache[key] = text
+                if len(self._response_cache) > self.response_cache_size:
+                    self._response_cache.popitem(last=False)
+        return text
+
+    def close(self):
+        """Release the timeout thread pool; in-flight or timed-out calls are not awaited."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _chat(self, messages):
         if self.provider.dialect == "openai":
+            # Built once per call; retries reuse it
+            msgs = [
+                {"role": m["role"], "content": m["content"]}
+                for m in messages
+                if m["role"] in _CHAT_ROLES
+            ]
 
             def _do():
-                msgs = [
-                    {"role": m["role"], "content": m["content"]}
-                    for m in messages
-                    if m["role"] in ("system", "user", "assistant")
-                ]
                 resp = self.client.chat.completions.create(
                     model=self.provider.model,
                     messages=msgs,
@@ -148,16 +265,13 @@ class LLMClient:
             return self._with_timeout_and_retry(_do)
 
         if self.provider.dialect == "gemini":
+            contents = [
+                {"role": _GEMINI_ROLE[m["role"]], "parts": [{"text": m["content"]}]}
+                for m in messages
+                if m["role"] in _GEMINI_ROLE
+            ]
 
             def _do():
-                contents = [
-                    {
-                        "role": ("model" if m["role"] == "assistant" else "user"),
-                        "parts": [{"text": m["content"]}],
-                    }
-                    for m in messages
-                    if m["role"] in ("system", "user", "assistant")
-                ]
                 resp = self.client.generate_content(
                     contents,
                     generation_config={
@@ -237,6 +351,8 @@ class LLMClient:
 
         if self.provider.dialect == "gemini":
 
+            import google.generativeai as genai
+
             def _do():
                 return genai.embed_content(
                     model=self.provider.model,
@@ -255,6 +371,24 @@ def create_llm_client(provider: LLMConfig) -> LLMClient:
     return LLMClient(provider)
 
 
+# Mock-model prompt probes
+_MOCK_AGENT_RE = re.compile(r"You are\s+([^\n\.]+)")
+_MOCK_PHASE_RE = re.compile(r"Phase:\s*([a-zA-Z_]+)")
+_MOCK_HAND_RE = re.compile(r"Hand:\s*([\w\s]+)")
+_MOCK_RESPONSE = (
+    "--- Thoughts ---\n%s\n\n"
+    "--- Plan ---\n%s\n\n"
+    "--- Action ---\n%s\n\n"
+    "--- Plan Update ---\n%s\n"
+)
+_MOCK_RANK_INDEX = {
+    r: i
+    for i, r in enumerate(
+        ("3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A", "2", "SJ", "BJ")
+    )
+}
+
+
 class _MockModel:
     """Deterministic local stub for offline testing.
     Produces valid Thoughts/Plan/Action and optional Plan Update, with simple heuristics.
@@ -268,7 +402,7 @@ class _MockModel:
         sys_text = next((m["content"] for m in messages if m["role"] == "system"), "")
 
         # Identify agent name
-        m = re.search(r"You are\s+([^\n\.]+)", sys_text)
+        m = _MOCK_AGENT_RE.search(sys_text)
         agent_name = m.group(1).strip() if m else "Agent"
         self.agent_calls[agent_name] = self.agent_calls.get(agent_name, 0) + 1
         call_n = self.agent_calls[agent_name]
@@ -405,84 +539,44 @@ class _MockModel:
                     break
             phase = ""
             if status:
-                mm = re.search(r"Phase:\s*([a-zA-Z_]+)", status)
+                mm = _MOCK_PHASE_RE.search(status)
                 if mm:
                     phase = mm.group(1).strip()
             # Default conservative policy
-            act = {"action": "yield"}
+            action = {"action": "yield"}
             if phase == "bidding":
                 # First time: try to call, otherwise pass
                 if self.agent_calls[agent_name] == 1:
-                    act = {"action": "call_landlord"}
+                    action = {"action": "call_landlord"}
                 else:
-                    act = {"action": "pass"}
+                    action = {"action": "pass"}
                 thought = "Decide whether to call landlord."
                 plan = "1. Act in bidding. [CURRENT]"
             elif phase == "doubling":
-                act = {"action": "no_double"}
+                action = {"action": "no_double"}
                 thought = "Decline doubling."
                 plan = "1. Consider doubling. [CURRENT]"
             elif phase == "playing":
                 # Try to play the smallest single from the explicit Hand tokens in status
                 smallest = None
                 if status:
-                    hm = re.search(r"Hand:\s*([\w\s]+)", status)
+                    hm = _MOCK_HAND_RE.search(status)
                     if hm:
-                        toks = [
-                            t
-                            for t in hm.group(1).strip().split()
-                            if t and t != "(empty)"
-                        ]
-                        order = [
-                            "3",
-                            "4",
-                            "5",
-                            "6",
-                            "7",
-                            "8",
-                            "9",
-                            "10",
-                            "J",
-                            "Q",
-                            "K",
-                            "A",
-                            "2",
-                            "SJ",
-                            "BJ",
-                        ]
-                        for r in order:
-                            if r in toks:
-                                smallest = r
-                                break
+                        toks = [t for t in hm.group(1).split() if t in _MOCK_RANK_INDEX]
+                        smallest = min(toks, key=_MOCK_RANK_INDEX.__getitem__, default=None)
                 if smallest is None:
-                    act = {"action": "yield"}
+                    action = {"action": "yield"}
                     thought = "No cards to play."
                     plan = "1. Yield. [CURRENT]"
                 else:
-                    act = {"action": "play_cards", "cards": smallest}
+                    action = {"action": "play_cards", "cards": smallest}
                     thought = "Try a small single."
                     plan = "1. Play a small single. [CURRENT]"
             else:
                 thought = "Wait."
                 plan = "1. Yield. [CURRENT]"
 
-            # Render response
-            # Produce exact one Action block
-            inner = ""
-            if act["action"] == "play_cards":
-                inner = f"<cards>{act['cards']}</cards>"
-            xml = (
-                f'<Action name="{act["action"]}">{inner}</Action>'
-                if inner
-                else f'<Action name="{act["action"]}" />'
-            )
             plan_update = "no change"
-            return (
-                f"--- Thoughts ---\n{thought}\n\n"
-                f"--- Plan ---\n{plan}\n\n"
-                f"--- Action ---\n{xml}\n\n"
-                f"--- Plan Update ---\n{plan_update}"
-            )
 
         else:  # simple chat
             # One sentence per turn: if this is an intra-turn continuation (agent was nudged with 'Continue.'), then yield.
@@ -508,12 +602,7 @@ class _MockModel:
             plan_update = "no change"
 
         # Compose full response with XML Action
-        return (
-            f"--- Thoughts ---\n{thought}\n\n"
-            f"--- Plan ---\n{plan}\n\n"
-            f"--- Action ---\n{action_to_xml(action)}\n\n"
-            f"--- Plan Update ---\n{plan_update}\n"
-        )
+        return _MOCK_RESPONSE % (thought, plan, action_to_xml(action), plan_update)
 
 
 def action_to_xml(a):
@@ -1,23 +1,45 @@
+import sys
+
+
 class ShortTermMemory:
     def __init__(self):
         self.history = []
+        # Running total of content characters (drives history summarization)
+        self.chars = 0
 
     def append(self, role, content):
         # Merge with the last message if the role is the same
         if self.history and self.history[-1]["role"] == role:
             self.history[-1]["content"] += f"\n{content}"
+            self.chars += len(content) + 1
         else:
             self.history.append({"role": role, "content": content})
+            self.chars += len(content)
 
     def get_all(self):
         return self.history
 
     def clear(self):
         self.history = []
+        self.chars = 0
+
+    def load(self, history):
+        """Replace the history wholesale (deserialization).
+
+        Roles decoded from JSON are fresh strings per message; interning maps
+        them back onto the shared literals used by append.
+        """
+        chars = 0
+        for m in history:
+            m["role"] = sys.intern(m["role"])
+            chars += len(m["content"])
+        self.history = history
+        self.chars = chars
 
     def searilize(self, dialect="default"):
         if dialect == "default":
-            return [{"role": msg["role"], "content": msg["content"]} for msg in self.history]
+            # Entries hold exactly role/content; dict.copy keeps callers isolated
+            return [msg.copy() for msg in self.history]
         else:
             raise NotImplementedError(f"Unknown dialect: {dialect}")
 
@@ -1,4 +1,5 @@
 import random
+from collections import deque
 from copy import deepcopy
 from typing import Callable, Iterator, Optional
 
@@ -139,7 +140,7 @@ class LLMModeratedOrdering(Ordering):
         # Fixed types in prototype: moderator must be an Agent object
         self.moderator = moderator
         # Freeze the scheduling candidate set at init time
-        self._queue: list[str] = []
+        self._queue: deque[str] = deque()
 
     def set_simulation(self, sim):
         self.sim = sim
@@ -151,11 +152,11 @@ class LLMModeratedOrdering(Ordering):
                 self._refill_queue()
             if not self._queue:
                 # Fallback to simple sequential if nothing produced
-                self._queue.extend(list(self.names))
-            yield self._queue.pop(0)
+                self._queue.extend(self.names)
+            yield self._queue.popleft()
 
     def post_turn(self, agent_name: str) -> None:
-        print(f"Remaining schedule: {self._queue}")
+        print(f"Remaining schedule: {list(self._queue)}")
         if not self._queue:
             self._refill_queue()
 
@@ -208,10 +209,10 @@ class LLMModeratedOrdering(Ordering):
     # Allow schedule action to push into the queue
     def add_to_queue(self, names: list[str]) -> None:
         # Validate and extend
-        self._queue.extend([n for n in names if n in self.sim.agents])
+        self._queue.extend(n for n in names if n in self.sim.agents)
 
     def is_queue_empty(self) -> bool:
-        return len(self._queue) == 0
+        return not self._queue
 
 
 ORDERING_MAP = {
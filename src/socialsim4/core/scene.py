@@ -85,6 +85,10 @@ class Scene:
         """
         return [YieldAction()]
 
+    def get_available_actions(self, agent: Agent):
+        """Actions offered to the agent in its prompt right now. Default: its whole action space."""
+        return agent.action_space
+
     # For ControlledOrdering reconstruction after deserialize
     def get_controlled_next(self, simulator: "Simulator") -> str | None:
         return None
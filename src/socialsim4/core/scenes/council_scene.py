@@ -13,6 +13,8 @@ class CouncilScene(SimpleChatScene):
         self.state["voting_started"] = False
         self.state["voting_completed_announced"] = False
         self.complete = False
+        # request_brief material by topic key; runtime-only, not serialized
+        self.brief_cache = {}
 
     def get_scene_actions(self, agent: Agent):
         actions = super().get_scene_actions(agent)
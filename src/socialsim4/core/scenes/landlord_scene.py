@@ -1,4 +1,5 @@
 import random
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 
 from socialsim4.core.actions.base_actions import SendMessageAction, YieldAction
@@ -365,9 +366,7 @@ class LandlordPokerScene(Scene):
                 self.state.get("played_flags", {}).get(p, False) for p in farmers
             )
             if not farmers_played:
-                self.state["score_multiplier"] = (
-                    int(self.state.get("score_multiplier", 1)) * 2
-                )
+                self._double_multiplier()
                 simulator.broadcast(PublicEvent("Spring! Multiplier doubled."))
             self.state["winner_team"] = "landlord"
         else:
@@ -375,9 +374,7 @@ class LandlordPokerScene(Scene):
                 self.state.get("played_flags", {}).get(landlord, False)
             )
             if not landlord_played:
-                self.state["score_multiplier"] = (
-                    int(self.state.get("score_multiplier", 1)) * 2
-                )
+                self._double_multiplier()
                 simulator.broadcast(PublicEvent("Counter-spring! Multiplier doubled."))
             self.state["winner_team"] = "farmers"
         self.state["phase"] = "complete"
@@ -398,33 +395,35 @@ class LandlordPokerScene(Scene):
                 single.extend([r, r, r, r])
         return single * int(getattr(self, "num_decks", 1) or 1)
 
-    def _parse_cards_str(self, s: str) -> List[str]:
-        parts = [p.strip() for p in s.strip().split(" ") if p.strip()]
+    def _parse_cards_str(self, s: str) -> Tuple[List[str], str]:
+        """Return (tokens, display string) from one scan of s."""
+        parts = [p for p in map(str.strip, s.split(" ")) if p]
         # strict tokens only
         for p in parts:
-            if p not in RANK_ORDER:
+            if p not in RANK_VALUE:
                 raise ValueError("Unknown card token: " + p)
-        return parts
+        return parts, " ".join(parts)
 
     def _has_cards(self, name: str, tokens: List[str]) -> bool:
         hand = self.state.get("hands")[name]
-        counts: Dict[str, int] = {}
-        for t in tokens:
-            counts[t] = counts.get(t, 0) + 1
-        for r, c in counts.items():
-            if hand.get(r, 0) < c:
-                return False
-        return True
+        return all(hand.get(r, 0) >= c for r, c in Counter(tokens).items())
 
     def _remove_cards(self, name: str, tokens: List[str]):
         hand = self.state.get("hands")[name]
-        for t in tokens:
-            hand[t] = hand.get(t, 0) - 1
-            if hand[t] == 0:
-                del hand[t]
+        # One update per distinct rank; emptied ranks are dropped
+        for r, c in Counter(tokens).items():
+            left = hand.get(r, 0) - c
+            if left:
+                hand[r] = left
+            else:
+                del hand[r]
         # Mark that this player has played at least once
         self.state.setdefault("played_flags", {})[name] = True
 
+    def _double_multiplier(self):
+        # score_multiplier is always an int (set at init and on redeal)
+        self.state["score_multiplier"] <<= 1
+
     def _hand_size(self, name: str) -> int:
         hand = self.state.get("hands")[name]
         return sum(hand.values())
@@ -432,63 +431,47 @@ class LandlordPokerScene(Scene):
     # ----- Combination evaluation -----
     def _evaluate_combo(self, tokens: List[str]) -> Optional[Dict]:
         n = len(tokens)
-        counts: Dict[str, int] = {}
-        for t in tokens:
-            counts[t] = counts.get(t, 0) + 1
-        ranks_sorted = sorted(counts.keys(), key=lambda r: RANK_VALUE[r])
+        counts = Counter(tokens)
+        ranks_sorted = sorted(counts, key=RANK_VALUE.__getitem__)
+        # Group ranks by multiplicity once (each group ascending by rank)
+        by_count: Dict[int, List[str]] = {}
+        for r in ranks_sorted:
+            by_count.setdefault(counts[r], []).append(r)
+        quads = by_count.get(4, [])
+        triples = by_count.get(3, [])
+        pairs = by_count.get(2, [])
 
         def is_consecutive(rs: List[str]) -> bool:
             # No 2 or jokers in straights
             if any(r in ("2", "SJ", "BJ") for r in rs):
                 return False
-            vals = [RANK_VALUE[r] for r in rs]
-            for i in range(1, len(vals)):
-                if vals[i] != vals[i - 1] + 1:
-                    return False
-            return True
+            return RANK_VALUE[rs[-1]] - RANK_VALUE[rs[0]] == len(rs) - 1
 
         # Rocket
-        if n == 2 and set(tokens) == {"SJ", "BJ"}:
+        if n == 2 and counts["SJ"] == 1 and counts["BJ"] == 1:
             return {"type": "rocket", "key": "BJ", "len": 2}
 
         # Bomb: four-of-a-kind (always); eight-of-a-kind if using two decks
         if len(counts) == 1:
             r = ranks_sorted[0]
-            c = list(counts.values())[0]
-            if c == 4 or (getattr(self, "num_decks", 1) == 2 and c == 8):
-                return {"type": "bomb", "key": r, "len": c}
-
-        # Four-with-two singles
-        if n == 6:
-            quad = [r for r, c in counts.items() if c == 4]
-            if len(quad) == 1:
-                q = quad[0]
-                others = sum(c for r, c in counts.items() if r != q)
-                if others == 2:
-                    return {"type": "four_two_singles", "key": q, "len": 6}
+            if n == 4 or (getattr(self, "num_decks", 1) == 2 and n == 8):
+                return {"type": "bomb", "key": r, "len": n}
+
+        # Four-with-two singles (the two non-quad cards are the attachments)
+        if n == 6 and len(quads) == 1:
+            return {"type": "four_two_singles", "key": quads[0], "len": 6}
 
         # Four-with-two pairs
-        if n == 8:
-            quad = [r for r, c in counts.items() if c == 4]
-            if len(quad) == 1:
-                q = quad[0]
-                pairs = [r for r, c in counts.items() if r != q and c == 2]
-                if len(pairs) == 2:
-                    return {"type": "four_two_pairs", "key": q, "len": 8}
+        if n == 8 and len(quads) == 1 and len(pairs) == 2:
+            return {"type": "four_two_pairs", "key": quads[0], "len": 8}
 
         # Triples and attachments
-        if n == 3 and len(counts) == 1 and list(counts.values())[0] == 3:
-            r = ranks_sorted[0]
-            return {"type": "triple", "key": r, "len": 3}
-        if n == 4:
-            triple_r = [r for r, c in counts.items() if c == 3]
-            if len(triple_r) == 1:
-                return {"type": "triple_single", "key": triple_r[0], "len": 4}
-        if n == 5:
-            triple_r = [r for r, c in counts.items() if c == 3]
-            pair_r = [r for r, c in counts.items() if c == 2]
-            if len(triple_r) == 1 and len(pair_r) == 1 and triple_r[0] != pair_r[0]:
-                return {"type": "triple_pair", "key": triple_r[0], "len": 5}
+        if n == 3 and len(triples) == 1:
+            return {"type": "triple", "key": triples[0], "len": 3}
+        if n == 4 and len(triples) == 1:
+            return {"type": "triple_single", "key": triples[0], "len": 4}
+        if n == 5 and len(triples) == 1 and len(pairs) == 1:
+            return {"type": "triple_pair", "key": triples[0], "len": 5}
 
         # Singles and pairs
         if n == 1:
@@ -504,47 +487,31 @@ class LandlordPokerScene(Scene):
                 return {"type": "straight", "key": ranks_sorted[-1], "len": n}
 
         # Double sequence (>=3 pairs)
-        if n % 2 == 0:
-            pair_ranks = [r for r, c in counts.items() if c == 2]
-            if len(pair_ranks) * 2 == n:
-                ps = sorted(pair_ranks, key=lambda r: RANK_VALUE[r])
-                if len(ps) >= 3 and is_consecutive(ps):
-                    return {"type": "double_seq", "key": ps[-1], "len": n}
+        if len(pairs) * 2 == n and len(pairs) >= 3 and is_consecutive(pairs):
+            return {"type": "double_seq", "key": pairs[-1], "len": n}
 
         # Triple sequence (>=2 triples) and airplanes
-        triple_ranks = [r for r, c in counts.items() if c == 3]
-        if triple_ranks:
-            ts = sorted(triple_ranks, key=lambda r: RANK_VALUE[r])
-            if len(ts) >= 2 and is_consecutive(ts):
-                m = len(ts)
-                if n == m * 3:
-                    return {"type": "triple_seq", "key": ts[-1], "len": n, "m": m}
-                # airplane + singles
-                if n == m * 4:
-                    # verify attachments exclude triple ranks
-                    attach = []
-                    for r, c in counts.items():
-                        if r not in ts:
-                            attach.extend([r] * c)
-                    if len(attach) == m:
-                        return {
-                            "type": "airplane_singles",
-                            "key": ts[-1],
-                            "len": n,
-                            "m": m,
-                        }
-                # airplane + pairs
-                if n == m * 5:
-                    pairs = [r for r, c in counts.items() if r not in ts and c == 2]
-                    if len(pairs) == m:
-                        pr = sorted(pairs, key=lambda r: RANK_VALUE[r])
-                        return {
-                            "type": "airplane_pairs",
-                            "key": ts[-1],
-                            "len": n,
-                            "m": m,
-                            "pair_top": pr[-1],
-                        }
+        if len(triples) >= 2 and is_consecutive(triples):
+            m = len(triples)
+            if n == m * 3:
+                return {"type": "triple_seq", "key": triples[-1], "len": n, "m": m}
+            # airplane + singles: the m cards outside the triples are attachments
+            if n == m * 4:
+                return {
+                    "type": "airplane_singles",
+                    "key": triples[-1],
+                    "len": n,
+                    "m": m,
+                }
+            # airplane + pairs
+            if n == m * 5 and len(pairs) == m:
+                return {
+                    "type": "airplane_pairs",
+                    "key": triples[-1],
+                    "len": n,
+                    "m": m,
+                    "pair_top": pairs[-1],
+                }
 
         return None
 
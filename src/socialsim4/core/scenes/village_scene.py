@@ -14,6 +14,9 @@ from socialsim4.core.event import StatusEvent
 from socialsim4.core.scene import Scene
 from socialsim4.core.simulator import Simulator
 
+# Routes kept per map (oldest evicted first)
+ROUTE_CACHE_SIZE = 4096
+
 
 class MapLocation:
     """地图上的一个位置点"""
@@ -98,6 +101,11 @@ class GameMap:
         self.grid = {}  # 坐标到位置名称的映射
         # Sparse storage of tiles: only store non-default tiles explicitly
         self.tiles: Dict[Tuple[int, int], Tile] = {}
+        # (start, goal) -> (path, path_cost); cleared whenever a tile changes
+        self._route_cache: Dict[
+            Tuple[Tuple[int, int], Tuple[int, int]],
+            Tuple[Optional[List[Tuple[int, int]]], int],
+        ] = {}
 
     def serialize(self):
         """Serializes the map to a dictionary."""
@@ -234,13 +242,13 @@ class GameMap:
     ) -> List[MapLocation]:
         """获取附近的位置"""
         nearby = []
-        for location in sorted(
-            self.locations.values(), key=lambda loc: (loc.y, loc.x, loc.name)
-        ):
+        for location in self.locations.values():
             distance = abs(location.x - x) + abs(location.y - y)
             if distance <= radius:
-                nearby.append(location)
-        return sorted(nearby, key=lambda loc: abs(loc.x - x) + abs(loc.y - y))
+                nearby.append((distance, location.y, location.x, location.name, location))
+        # Closest first; ties by (y, x, name)
+        nearby.sort(key=lambda item: item[:4])
+        return [item[4] for item in nearby]
 
     def get_tile(self, x: int, y: int) -> Tile:
         """Return tile, defaulting to passable plain if unset."""
@@ -266,6 +274,7 @@ class GameMap:
         if resources is not None:
             tile.resources = resources
         self.tiles[(x, y)] = tile
+        self._route_cache.clear()
 
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -295,13 +304,20 @@ class GameMap:
         if not (self.is_passable(*start) and self.is_passable(*goal)):
             return None
 
-        open_heap: List[Tuple[float, Tuple[int, int]]] = []
-        heapq.heappush(open_heap, (0, start))
+        gx, gy = goal
+        width, height, tiles = self.width, self.height, self.tiles
+        # Heap entries are (f, h, g, node): among equal f, expand the node
+        # closest to the goal first, which avoids flooding open terrain
+        # where many routes tie.
+        h0 = self.heuristic(start, goal)
+        open_heap: List[Tuple[float, float, float, Tuple[int, int]]] = [
+            (h0, h0, 0, start)
+        ]
         came_from: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
         g_score: Dict[Tuple[int, int], float] = {start: 0}
 
         while open_heap:
-            _, current = heapq.heappop(open_heap)
+            _, _, g, current = heapq.heappop(open_heap)
             if current == goal:
                 # Reconstruct path
                 path = []
@@ -310,19 +326,98 @@ class GameMap:
                     current = came_from[current]
                 path.reverse()
                 return path
+            if g > g_score[current]:
+                continue  # stale entry; a cheaper route was found later
 
             cx, cy = current
-            for nx, ny in self.neighbors(cx, cy):
-                tentative_g = g_score[current] + self.get_tile(nx, ny).movement_cost
+            for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
                 neighbor = (nx, ny)
+                # Unset tiles are default plains: passable, cost 1
+                tile = tiles.get(neighbor)
+                if tile is None:
+                    step = 1
+                elif tile.passable:
+                    step = tile.movement_cost
+                else:
+                    continue
+                tentative_g = g + step
                 if tentative_g < g_score.get(neighbor, float("inf")):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score = tentative_g + self.heuristic(neighbor, goal)
-                    heapq.heappush(open_heap, (f_score, neighbor))
+                    h = abs(nx - gx) + abs(ny - gy)
+                    heapq.heappush(
+                        open_heap, (tentative_g + h, h, tentative_g, neighbor)
+                    )
 
         return None
 
+    def try_straight_path(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """4-connected line walk from start to goal, or None.
+
+        Accepted only if every tile entered is passable with unit cost: the
+        walk then has Manhattan length at unit cost, which no path can beat,
+        so callers may skip A*.
+        """
+        (x, y), (gx, gy) = start, goal
+        if not self.is_passable(x, y):
+            return None
+        dx, dy = abs(gx - x), abs(gy - y)
+        step_x = 1 if gx > x else -1
+        step_y = 1 if gy > y else -1
+        path = [start]
+        ix = iy = 0
+        for _ in range(dx + dy):
+            # Step along whichever axis the ideal line crosses next
+            if (1 + 2 * ix) * dy < (1 + 2 * iy) * dx:
+                x += step_x
+                ix += 1
+            else:
+                y += step_y
+                iy += 1
+            if not self.is_passable(x, y):
+                return None
+            if max(1, int(self.get_tile(x, y).movement_cost)) != 1:
+                return None
+            path.append((x, y))
+        return path
+
+    def _is_cheap_step(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """Adjacent goal whose direct step is provably optimal.
+
+        Any detour around one orthogonal step takes at least 3 moves, so a
+        direct step costing at most 3 cannot be beaten.
+        """
+        if abs(start[0] - goal[0]) + abs(start[1] - goal[1]) != 1:
+            return False
+        if not (self.is_passable(*start) and self.is_passable(*goal)):
+            return False
+        return max(1, int(self.get_tile(*goal).movement_cost)) <= 3
+
+    def find_route(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> Tuple[Optional[List[Tuple[int, int]]], int]:
+        """Cached (find_path, path_cost) pair; the returned path is shared, do not mutate."""
+        key = (start, goal)
+        route = self._route_cache.get(key)
+        if route is None:
+            path = self.try_straight_path(start, goal)
+            if path is not None:
+                route = (path, len(path) - 1)
+            elif self._is_cheap_step(start, goal):
+                path = [start, goal]
+                route = (path, self.path_cost(path))
+            else:
+                path = self.find_path(start, goal)
+                route = (path, self.path_cost(path))
+            if len(self._route_cache) >= ROUTE_CACHE_SIZE:
+                del self._route_cache[next(iter(self._route_cache))]
+            self._route_cache[key] = route
+        return route
+
     def path_cost(self, path: List[Tuple[int, int]]) -> int:
         if not path:
             return 0
@@ -552,6 +647,21 @@ Inventory: {agent.properties["inventory"]}
 Current time: {hours}:{mins:02d} ({time_of_day})
 """
 
+    def agents_within(
+        self, simulator: Simulator, xy, radius: int, exclude: str
+    ) -> List[Tuple[int, str]]:
+        """(distance, name) of agents within Manhattan radius of xy, in agent order."""
+        x0, y0 = xy
+        found = []
+        for name, other in simulator.agents.items():
+            oxy = other.properties.get("map_xy")
+            if name == exclude or not oxy:
+                continue
+            dist = abs(oxy[0] - x0) + abs(oxy[1] - y0)
+            if dist <= radius:
+                found.append((dist, name))
+        return found
+
     def deliver_message(self, event, sender: Agent, simulator: Simulator):
         """Limit chat delivery to agents within chat_range (Manhattan distance)."""
         time = self.state.get("time")
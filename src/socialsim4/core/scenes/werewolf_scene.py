@@ -77,11 +77,31 @@ class WerewolfScene(Scene):
             YieldAction(),
         ]
 
+    def get_available_actions(self, agent: Agent):
+        # Hide actions whose PHASE/ROLE tags rule them out right now: phase-tagged
+        # actions need a living agent in that phase (and holding ROLE, if tagged).
+        # Untagged actions are always offered; handlers keep their own guards.
+        st = self.state
+        phase = st.get("phase")
+        alive = agent.name in st["alive"]
+        role = st["roles"].get(agent.name)
+        return [
+            a
+            for a in agent.action_space
+            if getattr(a, "PHASE", None) is None
+            or (
+                alive
+                and a.PHASE == phase
+                and getattr(a, "ROLE", role) == role
+            )
+        ]
+
     def _alive(self) -> List[str]:
-        return list(self.state.get("alive", []))
+        """Living players in seat order (the live list; do not mutate)."""
+        return self.state["alive"]
 
     def _is_alive(self, name: str) -> bool:
-        return name in self.state.get("alive", [])
+        return name in self.state["alive"]
 
     def _role(self, name: str) -> Optional[str]:
         return self.state.get("roles", {}).get(name)
@@ -212,7 +232,7 @@ class WerewolfScene(Scene):
     def _resolve_lynch(self, simulator: Simulator, prefer_plurality: bool = True):
         counts = Counter(
             t
-            for v, t in self.state.get("lynch_votes", {}).items()
+            for v, t in self.state["lynch_votes"].items()
             if self._is_alive(v) and self._is_alive(t)
         )
         lynched: Optional[str] = None
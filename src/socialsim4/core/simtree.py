@@ -192,6 +192,16 @@ class SimTree:
 
         return sim_copy
 
+    def _release_clients(self, sim: Simulator) -> None:
+        """把分支的专属 clients 还给池（isolated 模式下会关闭克隆的 client）。"""
+        if self._client_pool is not None:
+            self._client_pool.release(sim.clients)
+
+    def close(self) -> None:
+        """释放整棵树所有节点的分支 clients；树被丢弃或替换时调用。"""
+        for node in self.nodes.values():
+            self._release_clients(node["sim"])
+
     def _check_simulator_clone(self, base: Simulator, cloned: Simulator) -> None:
         """Basic sanity checks to ensure cloned simulator is independent and consistent.
 
@@ -616,6 +626,7 @@ class SimTree:
             if nid in self.children:
                 del self.children[nid]
             if nid in self.nodes:
+                self._release_clients(self.nodes[nid]["sim"])
                 del self.nodes[nid]
         if root_parent is not None:
             ch = self.children.get(root_parent, [])
@@ -66,6 +66,11 @@ class Simulator:
             self.scene.pre_run(self)
         self.started = True
 
+    @property
+    def non_host_members(self) -> list:
+        """Voting members (everyone but the Host), in agent order; read from self.agents on each access."""
+        return [n for n in self.agents if n != "Host"]
+
     # ----- Event plumbing: forward to ordering and external handler -----
 
     def emit_event(self, event_type: str, data: dict):
@@ -129,9 +134,10 @@ class Simulator:
         time = self.scene.state.get("time")
         formatted = event.to_string(time)
 
+        allowed = None if receivers is None else set(receivers)
         recipients = []
         for agent in self.agents.values():
-            if agent.name != sender and (receivers is None or agent.name in receivers):
+            if agent.name != sender and (allowed is None or agent.name in allowed):
                 agent.add_env_feedback(formatted)
                 recipients.append(agent.name)
 
@@ -4,16 +4,36 @@ import httpx
 from urllib.parse import urlparse
 
 
+# Shared across calls so repeated fetches reuse keep-alive connections
+# (httpx.Client is safe to use from several simulator threads).
+_CLIENT = httpx.Client(
+    follow_redirects=True,
+    transport=httpx.HTTPTransport(
+        retries=1,  # retry a failed connect once (stale keep-alive, DNS blip)
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    ),
+)
+# Stop reading a response body past this many bytes
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+
 def http_get(url: str, headers=None, timeout=10):
     """GET a URL and return (text, content_type) using httpx.
 
-    Raises RuntimeError on HTTP/network errors.
+    The body is streamed and cut off at MAX_BODY_BYTES.
+    Raises httpx.HTTPError on HTTP/network errors.
     """
-    with httpx.Client(follow_redirects=True, timeout=timeout, headers=headers or {}) as client:
-        resp = client.get(url)
+    with _CLIENT.stream("GET", url, headers=headers or {}, timeout=timeout) as resp:
         resp.raise_for_status()
         content_type = resp.headers.get("content-type", "")
-        text = resp.text
+        buf = bytearray()
+        for chunk in resp.iter_bytes():
+            buf += chunk
+            if len(buf) >= MAX_BODY_BYTES:
+                break
+        text = bytes(buf[:MAX_BODY_BYTES]).decode(
+            resp.encoding or "utf-8", errors="replace"
+        )
         return text, content_type
 
 
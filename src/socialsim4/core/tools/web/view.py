@@ -1,18 +1,22 @@
 import re
+import threading
+import time
+from collections import OrderedDict
+
 import trafilatura
 
 from .http import http_get, safe_http_https_only, strip_html_text
 
 
-def view_page(url: str, max_chars: int = 4000):
-    """Fetch and return a text preview of a web page.
+# Extracted pages keyed by URL: url -> (fetched_at, title, text, content_type)
+PAGE_CACHE_SIZE = 512
+PAGE_CACHE_TTL = 300.0  # seconds
+_page_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_page_cache_lock = threading.Lock()
 
-    Returns dict: {title: str|None, text: str, truncated: bool, content_type: str|None}
-    Raises: Exception on invalid URL or network errors
-    """
-    if not safe_http_https_only(url):
-        raise ValueError("only http/https URLs are allowed")
 
+def _fetch_page(url: str):
+    """Fetch url and extract (title, text, content_type), uncached."""
     headers = {
         "User-Agent": "Mozilla/5.0 (compatible; SocialSim/1.0)",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -36,6 +40,37 @@ def view_page(url: str, max_chars: int = 4000):
         m = re.search(r"<title[^>]*>([\s\S]*?)</title>", body, flags=re.IGNORECASE)
         if m:
             title = strip_html_text(m.group(1))
+    return title, text, content_type
+
+
+def view_page(url: str, max_chars: int = 4000):
+    """Fetch and return a text preview of a web page.
+
+    Extracted pages are cached per URL for PAGE_CACHE_TTL seconds, so agents
+    viewing the same page (at any max_chars) share one fetch.
+
+    Returns dict: {title: str|None, text: str, truncated: bool, content_type: str|None}
+    Raises: Exception on invalid URL or network errors
+    """
+    if not safe_http_https_only(url):
+        raise ValueError("only http/https URLs are allowed")
+
+    now = time.monotonic()
+    with _page_cache_lock:
+        entry = _page_cache.get(url)
+        if entry is not None and now - entry[0] < PAGE_CACHE_TTL:
+            _page_cache.move_to_end(url)
+        else:
+            entry = None
+    if entry is None:
+        # Fetch outside the lock; concurrent misses on one URL may both fetch
+        entry = (now, *_fetch_page(url))
+        with _page_cache_lock:
+            _page_cache[url] = entry
+            _page_cache.move_to_end(url)
+            while len(_page_cache) > PAGE_CACHE_SIZE:
+                _page_cache.popitem(last=False)
+    _, title, text, content_type = entry
 
     max_chars = max(500, min(20000, int(max_chars)))
     truncated = len(text) > max_chars
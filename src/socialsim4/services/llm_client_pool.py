@@ -774,3 +774,20 @@ class LLMClientPool:
 
         # 强隔离模式：每次深拷贝 clients
         return {name: self._clone_client(c) for name, c in self._base_clients.items()}
+
+    def release(self, clients: Dict[str, object]) -> None:
+        """
+        归还 acquire() 得到的 clients dict。
+
+        - shared 模式：实例属于 base_clients，不做任何事；
+        - isolated 模式：关闭克隆出来的 client（如 LLMClient 的线程池），base_clients 本身不动。
+        """
+        if self.mode == "shared":
+            return
+        base_ids = {id(c) for c in self._base_clients.values()}
+        for c in {id(c): c for c in clients.values()}.values():
+            if id(c) in base_ids:
+                continue
+            close_method = getattr(c, "close", None)
+            if callable(close_method):
+                close_method()
@@ -64,7 +64,7 @@ def test_llm_client_retries_on_exception():
             self.calls += 1
             if self.calls <= self.fail_times:
                 # 模拟 LLM 调用抛错
-                raise RuntimeError("transient LLM error")
+                raise ConnectionError("transient LLM error")
             return "OK_AFTER_RETRIES"
 
     flaky = FlakyModel(fail_times=2)
@@ -79,6 +79,34 @@ def test_llm_client_retries_on_exception():
     assert flaky.calls == 3
 
 
+def test_llm_client_does_not_retry_permanent_errors():
+    """
+    场景：底层模型抛出非瞬时错误（如配置/编程错误）。
+
+    期望：chat() 立即抛出该异常，不做重试。
+    """
+
+    cfg = make_mock_config()
+    client = LLMClient(cfg)
+    client.max_retries = 3
+    client.retry_backoff_s = 0.01
+
+    class BrokenModel:
+        def __init__(self):
+            self.calls = 0
+
+        def chat(self, messages):
+            self.calls += 1
+            raise ValueError("bad request")
+
+    broken = BrokenModel()
+    client.client = broken
+
+    with pytest.raises(ValueError):
+        client.chat([{"role": "user", "content": "hello"}])
+    assert broken.calls == 1
+
+
 # ------------------------------------------------------------------------
 # 2) 测试：LLMClient 的“超时 + 重试”是否真的会起作用
 # ------------------------------------------------------------------------
@@ -234,6 +262,25 @@ def test_llm_client_pool_returns_isolated_clients():
     assert base_client.state == {}
 
 
+def test_llm_client_pool_release_closes_isolated_clones():
+    """
+    场景：isolated 模式下 acquire() 得到克隆的 LLMClient，随后 release()。
+
+    期望：克隆 client 的线程池被关闭，base client 的线程池不受影响。
+    """
+
+    base_client = LLMClient(make_mock_config())
+    pool = LLMClientPool({"chat": base_client}, mode="isolated")
+
+    branch = pool.acquire(branch_id="branch-1")
+    assert branch["chat"] is not base_client
+
+    pool.release(branch)
+
+    assert branch["chat"]._executor._shutdown
+    assert not base_client._executor._shutdown
+
+
 # ------------------------------------------------------------------------
 # 5) （可选强化）测试：池本身不会被 acquire() 污染 base_clients
 # ------------------------------------------------------------------------
@@ -257,3 +304,47 @@ def test_llm_client_pool_does_not_mutate_base_clients():
 
     # 原始 base_client.flag 仍然保持 False，说明 clone 生效
     assert base_client.flag is False
+
+
+# ------------------------------------------------------------------------
+# 6) 测试：精确匹配响应缓存（默认关闭；开启后相同消息只调用一次模型）
+# ------------------------------------------------------------------------
+def test_llm_client_response_cache():
+    client = LLMClient(make_mock_config())
+    assert client.response_cache_size == 0
+
+    class CountingModel:
+        def __init__(self):
+            self.calls = 0
+
+        def chat(self, messages):
+            self.calls += 1
+            if messages[-1]["content"] == "chatter":
+                return f"no action {self.calls}"
+            return f'<Action name="reply{self.calls}" />'
+
+    model = CountingModel()
+    client.client = model
+    msgs = [{"role": "user", "content": "hello"}]
+
+    # 关闭时每次都真正调用
+    assert client.chat(msgs) == '<Action name="reply1" />'
+    assert client.chat(msgs) == '<Action name="reply2" />'
+
+    client.response_cache_size = 1
+    assert client.chat(msgs) == '<Action name="reply3" />'
+    assert client.chat(msgs) == '<Action name="reply3" />'
+    assert model.calls == 3
+
+    # 不同消息未命中，并按 LRU 淘汰旧条目
+    assert client.chat([{"role": "user", "content": "bye"}]) == '<Action name="reply4" />'
+    assert client.chat(msgs) == '<Action name="reply5" />'
+
+    # 没有 Action 块的回复（解析会失败）不缓存，重试时重新采样
+    chatter = [{"role": "user", "content": "chatter"}]
+    assert client.chat(chatter) == "no action 6"
+    assert client.chat(chatter) == "no action 7"
+    assert client.chat(msgs) == '<Action name="reply5" />'
+
+    # clone 拿到的是独立的空缓存
+    assert len(client.clone()._response_cache) == 0